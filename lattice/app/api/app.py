@@ -7,6 +7,7 @@ from urllib.parse import urlencode
 from uuid import uuid4
 
 from fastapi import Depends, FastAPI, File, Header, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import HTMLResponse, JSONResponse
 from pydantic import BaseModel, Field
 
@@ -22,6 +23,7 @@ from lattice.app.auth.contracts import AuthContext
 from lattice.app.auth.verify import (
     AuthConfigurationError,
     AuthVerificationError,
+    start_jwks_refresh,
     verify_supabase_bearer_token,
 )
 from lattice.app.graph.neo4j_store import Neo4jGraphStore, Neo4jSettings
@@ -31,7 +33,11 @@ from lattice.app.ingestion.service import (
     get_user_ingestion_job,
     list_user_ingestion_jobs,
 )
-from lattice.app.llm.providers import build_critic_model
+from lattice.app.llm.providers import (
+    CriticModel,
+    GeminiCriticModel,
+    build_critic_model,
+)
 from lattice.app.memory.service import (
     append_turn,
     get_recent_turns,
@@ -40,10 +46,13 @@ from lattice.app.memory.service import (
 from lattice.app.observability.service import create_trace, tool_trace
 from lattice.app.orchestration.service import run_orchestration
 from lattice.app.retrieval.embeddings import (
+    EmbeddingProvider,
+    GoogleGenerativeAIEmbeddingProvider,
     build_embedding_provider,
     build_runtime_embedding_provider,
 )
 from lattice.app.retrieval.supabase_store import SupabaseVectorStore
+from lattice.app.runtime.cache import BoundedCache
 from lattice.app.runtime.store import (
     CompletedOAuthSession,
     PendingOAuthState,
@@ -71,6 +80,7 @@ SUPPORTED_OAUTH_PROVIDERS = {
     "zoom",
 }
 OAUTH_STATE_TTL_SECONDS = 15 * 60
+RUNTIME_MODEL_CACHE_MAXSIZE = 32
 
 
 class QueryRequest(BaseModel):
@@ -128,6 +138,9 @@ def create_app() -> FastAPI:
     embedding_provider = build_embedding_provider(config.embedding_dimensions)
     supabase_store = _build_supabase_store(config)
     neo4j_store = _build_neo4j_store(config)
+    runtime_models_by_key: BoundedCache[
+        str | None, tuple[EmbeddingProvider, CriticModel]
+    ] = BoundedCache(maxsize=RUNTIME_MODEL_CACHE_MAXSIZE)
     ingestion_worker = IngestionWorker(
         store=runtime_store,
         embedding_provider=embedding_provider,
@@ -136,6 +149,7 @@ def create_app() -> FastAPI:
 
     @asynccontextmanager
     async def lifespan(_app: FastAPI):
+        start_jwks_refresh(auth_settings)
         await ingestion_worker.start()
         try:
             yield
@@ -143,6 +157,8 @@ def create_app() -> FastAPI:
             await ingestion_worker.stop()
             if neo4j_store:
                 neo4j_store.close()
+            if supabase_store:
+                supabase_store.close()
 
     app = FastAPI(title=config.app_name, version=config.app_version, lifespan=lifespan)
 
@@ -156,6 +172,39 @@ def create_app() -> FastAPI:
             runtime_store.oauth_pending_by_state.pop(state, None)
             runtime_store.oauth_completed_by_state.pop(state, None)
 
+    def _runtime_models(
+        runtime_key: str | None,
+    ) -> tuple[EmbeddingProvider, CriticModel]:
+        cached = runtime_models_by_key.get(runtime_key)
+        if cached is not None:
+            return cached
+        models = (
+            build_runtime_embedding_provider(
+                dimensions=config.embedding_dimensions,
+                runtime_key=runtime_key,
+                model=config.gemini_embedding_model,
+                backend=config.embedding_backend,
+            ),
+            build_critic_model(
+                runtime_key=runtime_key,
+                backend=config.critic_backend,
+                model=config.critic_model,
+            ),
+        )
+        embedding_provider, critic_model = models
+        # The factories fall back to deterministic models when a Google client
+        # fails to build; leave those uncached so the next query retries.
+        fell_back = (
+            config.embedding_backend == "google"
+            and not isinstance(embedding_provider, GoogleGenerativeAIEmbeddingProvider)
+        ) or (
+            config.critic_backend == "google"
+            and not isinstance(critic_model, GeminiCriticModel)
+        )
+        if not fell_back:
+            runtime_models_by_key[runtime_key] = models
+        return models
+
     def require_auth_context(
         authorization: str | None = Header(default=None, alias="Authorization"),
     ) -> AuthContext:
@@ -419,6 +468,9 @@ def create_app() -> FastAPI:
             )
             return {"action": "set", "has_key": True, "session_id": demo_session_id}
         if action == "clear":
+            runtime_models_by_key.pop(
+                runtime_store.runtime_keys_by_session.get(demo_session_id)
+            )
             clear_runtime_key(store=runtime_store, session_id=demo_session_id)
             return {"action": "clear", "has_key": False, "session_id": demo_session_id}
         if action == "status":
@@ -438,7 +490,9 @@ def create_app() -> FastAPI:
     ) -> dict[str, str | int | None]:
         file_bytes = await file.read()
         content_type = file.content_type or "application/octet-stream"
-        job = enqueue_ingestion_job(
+        # Enqueueing appends to the runtime WAL, which can wait on compaction.
+        job = await run_in_threadpool(
+            enqueue_ingestion_job,
             store=runtime_store,
             user_id=context.user_id,
             filename=file.filename or "uploaded-file",
@@ -544,17 +598,7 @@ def create_app() -> FastAPI:
                     ),
                 )
 
-        runtime_embedding_provider = build_runtime_embedding_provider(
-            dimensions=config.embedding_dimensions,
-            runtime_key=resolved_runtime_key,
-            model=config.gemini_embedding_model,
-            backend=config.embedding_backend,
-        )
-        critic_model = build_critic_model(
-            runtime_key=resolved_runtime_key,
-            backend=config.critic_backend,
-            model=config.critic_model,
-        )
+        runtime_embedding_provider, critic_model = _runtime_models(resolved_runtime_key)
 
         thread_id = payload.thread_id or f"thread-{uuid4().hex[:10]}"
         resolved_question, resolution_note = resolve_follow_up_question(
@@ -564,7 +608,10 @@ def create_app() -> FastAPI:
         )
 
         route_started = time.perf_counter()
-        result = run_orchestration(
+        # Retrieval and model calls block on I/O; running them off the event
+        # loop keeps concurrent queries from serializing behind one another.
+        result = await run_in_threadpool(
+            run_orchestration,
             store=runtime_store,
             question=resolved_question,
             user_id=maybe_context.user_id if maybe_context else None,
@@ -13,7 +13,8 @@ class SupabaseAuthSettings:
 
 
 def load_supabase_auth_settings() -> SupabaseAuthSettings:
-    supabase_url = os.getenv("SUPABASE_URL")
+    env = os.environ
+    supabase_url = env.get("SUPABASE_URL")
     default_jwks_url = (
         f"{supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json"
         if supabase_url
@@ -21,7 +22,7 @@ def load_supabase_auth_settings() -> SupabaseAuthSettings:
     )
     return SupabaseAuthSettings(
         supabase_url=supabase_url,
-        jwks_url=os.getenv("SUPABASE_JWKS_URL", default_jwks_url),
-        jwt_audience=os.getenv("SUPABASE_JWT_AUDIENCE"),
-        jwt_issuer=os.getenv("SUPABASE_JWT_ISSUER", supabase_url),
+        jwks_url=env.get("SUPABASE_JWKS_URL", default_jwks_url),
+        jwt_audience=env.get("SUPABASE_JWT_AUDIENCE"),
+        jwt_issuer=env.get("SUPABASE_JWT_ISSUER", supabase_url),
     )
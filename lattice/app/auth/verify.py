@@ -1,13 +1,24 @@
 from __future__ import annotations
 
+import logging
+import re
+import threading
 from dataclasses import dataclass
 
 import jwt
-from jwt import InvalidTokenError, PyJWKClient
+from jwt import InvalidTokenError, PyJWKClient, PyJWKClientError, PyJWKSetError
 
 from lattice.app.auth.config import SupabaseAuthSettings
 from lattice.app.auth.contracts import AuthContext
 
+logger = logging.getLogger(__name__)
+
+JWKS_CACHE_LIFESPAN_SECONDS = 60 * 60
+JWKS_REFRESH_INTERVAL_SECONDS = 15 * 60
+BEARER_PATTERN = re.compile(
+    r"\s*bearer \s*(\S(?:.*\S)?)\s*\Z", re.IGNORECASE | re.DOTALL
+)
+
 
 class AuthVerificationError(Exception):
     pass
@@ -24,24 +35,67 @@ class _JwksClientCacheEntry:
 
 
 _jwks_cache: dict[str, _JwksClientCacheEntry] = {}
+_jwks_refreshing: set[str] = set()
+_jwks_lock = threading.Lock()
 
 
 def _get_jwks_client(jwks_url: str) -> PyJWKClient:
     cached = _jwks_cache.get(jwks_url)
     if cached is not None:
         return cached.client
-    client = PyJWKClient(jwks_url)
-    _jwks_cache[jwks_url] = _JwksClientCacheEntry(url=jwks_url, client=client)
-    return client
+    with _jwks_lock:
+        cached = _jwks_cache.get(jwks_url)
+        if cached is not None:
+            return cached.client
+        client = PyJWKClient(
+            jwks_url,
+            cache_keys=True,
+            lifespan=JWKS_CACHE_LIFESPAN_SECONDS,
+        )
+        _jwks_cache[jwks_url] = _JwksClientCacheEntry(url=jwks_url, client=client)
+        return client
+
+
+def _refresh_jwks(jwks_url: str) -> None:
+    # Requests still fetch on demand if the background refresh fails, and the
+    # next refresh is scheduled whatever happened to this one.
+    try:
+        _get_jwks_client(jwks_url).get_jwk_set(refresh=True)
+    except (PyJWKClientError, PyJWKSetError) as exc:
+        logger.warning("Background JWKS refresh failed for %s: %s", jwks_url, exc)
+    except Exception:
+        logger.exception("Background JWKS refresh failed for %s", jwks_url)
+    finally:
+        timer = threading.Timer(
+            JWKS_REFRESH_INTERVAL_SECONDS, _refresh_jwks, args=(jwks_url,)
+        )
+        timer.daemon = True
+        timer.start()
+
+
+def start_jwks_refresh(settings: SupabaseAuthSettings) -> None:
+    jwks_url = settings.jwks_url
+    if not jwks_url:
+        return
+    with _jwks_lock:
+        if jwks_url in _jwks_refreshing:
+            return
+        _jwks_refreshing.add(jwks_url)
+    threading.Thread(
+        target=_refresh_jwks,
+        args=(jwks_url,),
+        name="jwks-refresh",
+        daemon=True,
+    ).start()
 
 
 def _extract_bearer_token(authorization: str | None) -> str:
     if not authorization:
         raise AuthVerificationError("Missing Authorization header")
-    parts = authorization.strip().split(" ", 1)
-    if len(parts) != 2 or parts[0].lower() != "bearer" or not parts[1].strip():
+    match = BEARER_PATTERN.match(authorization)
+    if match is None:
         raise AuthVerificationError("Authorization header must be Bearer token")
-    return parts[1].strip()
+    return match.group(1)
 
 
 def verify_supabase_bearer_token(
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from pathlib import Path
 
+import orjson
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
@@ -28,8 +28,7 @@ class EvalResult:
 def _load_cases() -> tuple[EvalCase, ...]:
     repo_root = Path(__file__).resolve().parents[3]
     path = repo_root / "data" / "eval" / "golden_questions.json"
-    with path.open("r", encoding="utf-8") as handle:
-        payload = json.load(handle)
+    payload = orjson.loads(path.read_bytes())
 
     cases: list[EvalCase] = []
     if not isinstance(payload, list):
@@ -9,7 +9,7 @@ class GraphQuery:
     route: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GraphEdge:
     source: str
     relationship: str
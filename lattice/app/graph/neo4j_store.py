@@ -1,11 +1,105 @@
 from __future__ import annotations
 
+import heapq
 import re
-from collections import OrderedDict
+import time
 from dataclasses import dataclass
+from functools import lru_cache
 
 from lattice.app.retrieval.contracts import RetrievalHit
 
+SLUG_PATTERN = re.compile(r"[^a-z0-9]+")
+EDGE_COUNT_STATEMENT = "MATCH ()-[rel]->() RETURN count(rel) AS edge_count"
+# Substring cues that steer which relationship queries a search runs.
+PERSON_QUERY_PATTERN = re.compile("director|directed|actor|actors|cast|starring")
+GENRE_QUERY_PATTERN = re.compile("genre|category")
+COUNTRY_QUERY_PATTERN = re.compile("country|where")
+RATING_QUERY_PATTERN = re.compile("rating|tv-ma|tv-14|tv-pg|pg-13|pg|g|r")
+TITLE_TEXT_INDEX = "title_text_idx"
+# queryNodes reports a missing index as a failed procedure call; the label scan
+# is used until a retry after the cooldown finds the index.
+MISSING_INDEX_ERROR_CODE = "Neo.ClientError.Procedure.ProcedureCallFailed"
+TITLE_INDEX_RETRY_SECONDS = 300.0
+TITLE_INDEX_SOURCE = (
+    f"CALL db.index.fulltext.queryNodes('{TITLE_TEXT_INDEX}', $lucene) YIELD node AS t"
+)
+TITLE_SCAN_SOURCE = "MATCH (t:Title)"
+# Literal lookups: a bare show id or a double-quoted exact title.
+SHOW_ID_QUERY_PATTERN = re.compile(r"s\d+")
+QUOTED_TITLE_QUERY_PATTERN = re.compile(r'"([^"]+)"')
+TITLE_SHOW_ID_SOURCE = """
+MATCH (t:Title {show_id: $show_id})
+WITH t, 1.0 AS score
+"""
+TITLE_EXACT_SOURCE = """
+MATCH (t:Title)
+WHERE toLower(t.title) = $title
+WITH t, 1.0 AS score
+"""
+TITLE_SCORE_CLAUSE = """
+WITH t, $terms AS terms
+WITH t,
+  reduce(score = 0.0, term IN terms |
+    score +
+    CASE WHEN toLower(coalesce(t.title, '')) CONTAINS term THEN 2.0 ELSE 0.0 END +
+    CASE WHEN toLower(coalesce(t.description, '')) CONTAINS term THEN 0.4 ELSE 0.0 END
+  ) AS score
+WHERE score > 0
+"""
+TITLE_PROFILE_RETURN = """
+WITH t, score
+ORDER BY score DESC, t.release_year DESC
+LIMIT $limit
+RETURN
+  t.show_id AS show_id,
+  t.title AS title,
+  t.type AS type,
+  t.release_year AS release_year,
+  coalesce(t.description, '') AS description,
+  [(d:Person)-[:DIRECTED]->(t) WHERE d.name IS NOT NULL | d.name] AS directors,
+  [(a:Person)-[:ACTED_IN]->(t) WHERE a.name IS NOT NULL | a.name] AS actors,
+  [(t)-[:IN_GENRE]->(g:Genre) WHERE g.name IS NOT NULL | g.name] AS genres,
+  [(t)-[:IN_COUNTRY]->(c:Country) WHERE c.name IS NOT NULL | c.name] AS countries,
+  head([(t)-[:HAS_RATING]->(r:Rating) WHERE r.code IS NOT NULL | r.code]) AS rating,
+  score AS relevance
+"""
+# Assembled once so every call sends identical text and hits the server's
+# query plan cache.
+TITLE_INDEX_STATEMENT = TITLE_INDEX_SOURCE + TITLE_SCORE_CLAUSE + TITLE_PROFILE_RETURN
+TITLE_SCAN_STATEMENT = TITLE_SCAN_SOURCE + TITLE_SCORE_CLAUSE + TITLE_PROFILE_RETURN
+TITLE_SHOW_ID_STATEMENT = TITLE_SHOW_ID_SOURCE + TITLE_PROFILE_RETURN
+TITLE_EXACT_STATEMENT = TITLE_EXACT_SOURCE + TITLE_PROFILE_RETURN
+
+
+@dataclass(frozen=True)
+class QueryCues:
+    terms: tuple[str, ...]
+    asks_person: bool
+    asks_genre: bool
+    asks_country: bool
+    asks_rating: bool
+
+
+@lru_cache(maxsize=1024)
+def _analyze_query(normalized_query: str) -> QueryCues:
+    terms = re.findall(r"[a-z0-9]+", normalized_query)
+    return QueryCues(
+        terms=tuple(term for term in terms if len(term) >= 2),
+        asks_person=PERSON_QUERY_PATTERN.search(normalized_query) is not None,
+        asks_genre=GENRE_QUERY_PATTERN.search(normalized_query) is not None,
+        asks_country=COUNTRY_QUERY_PATTERN.search(normalized_query) is not None,
+        asks_rating=RATING_QUERY_PATTERN.search(normalized_query) is not None,
+    )
+
+
+def _name_list(value: object, limit: int) -> list[str]:
+    # Pattern comprehensions keep one entry per relationship, so parallel
+    # relationships repeat a name; dedupe before capping the list.
+    if not isinstance(value, list):
+        return []
+    names = dict.fromkeys(name for name in value if isinstance(name, str) and name)
+    return list(names)[:limit]
+
 
 @dataclass(frozen=True)
 class Neo4jSettings:
@@ -18,11 +112,15 @@ class Neo4jSettings:
 class Neo4jGraphStore:
     def __init__(self, settings: Neo4jSettings) -> None:
         try:
-            from neo4j import GraphDatabase
+            from neo4j import GraphDatabase, RoutingControl
+            from neo4j.exceptions import ClientError
         except Exception as exc:  # pragma: no cover - optional dependency path
             raise RuntimeError("neo4j driver is required for graph retrieval") from exc
 
         self._settings = settings
+        self._read_routing = RoutingControl.READ
+        self._client_error = ClientError
+        self._title_index_retry_at = 0.0
         self._driver = GraphDatabase.driver(
             settings.uri,
             auth=(settings.username, settings.password),
@@ -32,53 +130,73 @@ class Neo4jGraphStore:
         self._driver.close()
 
     @staticmethod
-    def _query_terms(query: str) -> list[str]:
-        terms = re.findall(r"[a-z0-9]+", query.lower())
-        return [term for term in terms if len(term) >= 2]
-
-    @staticmethod
+    @lru_cache(maxsize=8192)
     def _slug(value: str) -> str:
-        normalized = re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-")
+        # Show ids and names recur across rows and queries.
+        normalized = SLUG_PATTERN.sub("-", value.lower()).strip("-")
         return normalized or "unknown"
 
     def _run(self, statement: str, **params: object) -> list[dict[str, object]]:
-        with self._driver.session(database=self._settings.database) as session:
-            result = session.run(statement, **params)
-            return [record.data() for record in result]
+        # Managed read transactions reuse pooled connections, route to readers
+        # on clusters, and retry transient failures.
+        records, _, _ = self._driver.execute_query(
+            statement,
+            params,
+            database_=self._settings.database,
+            routing_=self._read_routing,
+        )
+        return [record.data() for record in records]
 
-    def _title_profile_hits(self, terms: list[str], limit: int) -> list[RetrievalHit]:
-        statement = """
-        MATCH (t:Title)
-        WITH t, $terms AS terms
-        WITH t,
-          reduce(score = 0.0, term IN terms |
-            score +
-            CASE WHEN toLower(coalesce(t.title, '')) CONTAINS term THEN 2.0 ELSE 0.0 END +
-            CASE WHEN toLower(coalesce(t.description, '')) CONTAINS term THEN 0.4 ELSE 0.0 END
-          ) AS score
-        WHERE score > 0
-        OPTIONAL MATCH (d:Person)-[:DIRECTED]->(t)
-        OPTIONAL MATCH (a:Person)-[:ACTED_IN]->(t)
-        OPTIONAL MATCH (t)-[:IN_GENRE]->(g:Genre)
-        OPTIONAL MATCH (t)-[:IN_COUNTRY]->(c:Country)
-        OPTIONAL MATCH (t)-[:HAS_RATING]->(r:Rating)
-        RETURN
-          t.show_id AS show_id,
-          t.title AS title,
-          t.type AS type,
-          t.release_year AS release_year,
-          coalesce(t.description, '') AS description,
-          collect(DISTINCT d.name)[0..3] AS directors,
-          collect(DISTINCT a.name)[0..4] AS actors,
-          collect(DISTINCT g.name)[0..4] AS genres,
-          collect(DISTINCT c.name)[0..3] AS countries,
-          head(collect(DISTINCT r.code)) AS rating,
-          score AS relevance
-        ORDER BY relevance DESC, t.release_year DESC
-        LIMIT $limit
-        """
-        rows = self._run(statement, terms=terms, limit=limit)
+    def _title_profile_rows(
+        self, terms: list[str], limit: int
+    ) -> list[dict[str, object]]:
+        # The full-text index narrows candidates before the CONTAINS scoring below;
+        # databases loaded before the index existed fall back to a label scan.
+        if time.monotonic() >= self._title_index_retry_at:
+            lucene = " OR ".join(f"*{term}*" for term in terms)
+            try:
+                return self._run(
+                    TITLE_INDEX_STATEMENT,
+                    terms=terms,
+                    limit=limit,
+                    lucene=lucene,
+                )
+            except self._client_error as exc:
+                if not self._is_missing_title_index(exc):
+                    raise
+                self._title_index_retry_at = (
+                    time.monotonic() + TITLE_INDEX_RETRY_SECONDS
+                )
+        return self._run(TITLE_SCAN_STATEMENT, terms=terms, limit=limit)
+
+    @staticmethod
+    def _is_missing_title_index(exc: Exception) -> bool:
+        if getattr(exc, "code", None) != MISSING_INDEX_ERROR_CODE:
+            return False
+        message = getattr(exc, "message", None) or str(exc)
+        return TITLE_TEXT_INDEX in message
+
+    def _title_lookup_rows(
+        self, normalized_query: str, limit: int
+    ) -> list[dict[str, object]] | None:
+        # Exact lookups skip the term scoring and relationship queries; None
+        # means the query is not a literal lookup.
+        if SHOW_ID_QUERY_PATTERN.fullmatch(normalized_query):
+            return self._run(
+                TITLE_SHOW_ID_STATEMENT,
+                show_id=normalized_query,
+                limit=limit,
+            )
+        quoted = QUOTED_TITLE_QUERY_PATTERN.fullmatch(normalized_query)
+        if quoted:
+            return self._run(
+                TITLE_EXACT_STATEMENT,
+                title=quoted.group(1).strip(),
+                limit=limit,
+            )
+        return None
 
+    def _title_profile_hits(self, rows: list[dict[str, object]]) -> list[RetrievalHit]:
         hits: list[RetrievalHit] = []
         for row in rows:
             show_id = row.get("show_id")
@@ -104,14 +222,10 @@ class Neo4jGraphStore:
             if not isinstance(description, str):
                 description = ""
 
-            director_names = [
-                name for name in (directors or []) if isinstance(name, str)
-            ]
-            actor_names = [name for name in (actors or []) if isinstance(name, str)]
-            genre_names = [name for name in (genres or []) if isinstance(name, str)]
-            country_names = [
-                name for name in (countries or []) if isinstance(name, str)
-            ]
+            director_names = _name_list(directors, 3)
+            actor_names = _name_list(actors, 4)
+            genre_names = _name_list(genres, 4)
+            country_names = _name_list(countries, 3)
             rating_code = rating if isinstance(rating, str) and rating else "unknown"
             score = float(relevance) if isinstance(relevance, (int, float)) else 1.0
 
@@ -128,13 +242,14 @@ class Neo4jGraphStore:
             if description:
                 details.append(f"description: {description}")
 
+            title_slug = self._slug(show_id)
             hits.append(
                 RetrievalHit(
-                    source_id=f"title:{self._slug(show_id)}",
+                    source_id=f"title:{title_slug}",
                     score=score,
                     content="; ".join(details),
                     source_type="shared_graph",
-                    location=f"neo4j://title/{self._slug(show_id)}",
+                    location=f"neo4j://title/{title_slug}",
                 )
             )
         return hits
@@ -420,12 +535,9 @@ class Neo4jGraphStore:
         return hits
 
     @staticmethod
-    def _normalize_scores(hits: list[RetrievalHit]) -> list[RetrievalHit]:
-        if not hits:
-            return []
-        values = [hit.score for hit in hits]
-        minimum = min(values)
-        maximum = max(values)
+    def _normalize_scores(
+        hits: list[RetrievalHit], *, minimum: float, maximum: float
+    ) -> list[RetrievalHit]:
         if maximum <= minimum:
             return [
                 RetrievalHit(
@@ -454,33 +566,27 @@ class Neo4jGraphStore:
 
     def search(self, query: str, limit: int = 5) -> list[RetrievalHit]:
         normalized_query = query.lower().strip()
-        terms = self._query_terms(normalized_query)
-        if not terms:
+        lookup_rows = self._title_lookup_rows(normalized_query, limit)
+        if lookup_rows:
+            lookup_hits = self._title_profile_hits(lookup_rows)
+            if lookup_hits:
+                return lookup_hits
+
+        cues = _analyze_query(normalized_query)
+        if not cues.terms:
             return []
 
-        asks_person = any(
-            token in normalized_query
-            for token in ("director", "directed", "actor", "actors", "cast", "starring")
-        )
-        asks_genre = any(token in normalized_query for token in ("genre", "category"))
-        asks_country = any(token in normalized_query for token in ("country", "where"))
-        asks_rating = any(
-            token in normalized_query
-            for token in (
-                "rating",
-                "tv-ma",
-                "tv-14",
-                "tv-pg",
-                "pg-13",
-                "pg",
-                "g",
-                "r",
-            )
-        )
+        terms = list(cues.terms)
+        asks_person = cues.asks_person
+        asks_genre = cues.asks_genre
+        asks_country = cues.asks_country
+        asks_rating = cues.asks_rating
 
         candidate_hits: list[RetrievalHit] = []
         candidate_hits.extend(
-            self._title_profile_hits(terms=terms, limit=max(6, limit * 2))
+            self._title_profile_hits(
+                self._title_profile_rows(terms, limit=max(6, limit * 2))
+            )
         )
         if asks_person or not any((asks_genre, asks_country, asks_rating)):
             candidate_hits.extend(
@@ -502,19 +608,29 @@ class Neo4jGraphStore:
         if not candidate_hits:
             candidate_hits = self._fallback_relation_hits(query=query, limit=limit)
 
-        deduped: OrderedDict[str, RetrievalHit] = OrderedDict()
-        for hit in sorted(candidate_hits, key=lambda item: item.score, reverse=True):
-            deduped.setdefault(hit.source_id, hit)
+        if not candidate_hits:
+            return []
 
-        ranked = self._normalize_scores(list(deduped.values()))
-        return ranked[:limit]
+        # Keep the best-scoring hit per source; ties go to the earliest candidate,
+        # matching a stable descending sort.
+        best: dict[str, tuple[int, RetrievalHit]] = {}
+        for position, hit in enumerate(candidate_hits):
+            current = best.get(hit.source_id)
+            if current is None or hit.score > current[1].score:
+                best[hit.source_id] = (position, hit)
+
+        scores = [hit.score for _, hit in best.values()]
+        top = heapq.nlargest(
+            limit, best.values(), key=lambda row: (row[1].score, -row[0])
+        )
+        return self._normalize_scores(
+            [hit for _, hit in top], minimum=min(scores), maximum=max(scores)
+        )
 
     def count_edges(self) -> int:
-        statement = "MATCH ()-[rel]->() RETURN count(rel) AS edge_count"
-        with self._driver.session(database=self._settings.database) as session:
-            result = session.run(statement)
-            row = result.single()
-        if not row:
+        rows = self._run(EDGE_COUNT_STATEMENT)
+        if not rows:
             return 0
+        row = rows[0]
         count = row.get("edge_count")
         return int(count) if isinstance(count, int) else 0
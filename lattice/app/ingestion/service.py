@@ -27,7 +27,14 @@ from lattice.app.ingestion.parsers import (
 )
 from lattice.app.retrieval.embeddings import EmbeddingProvider
 from lattice.app.retrieval.supabase_store import SupabaseVectorStore
-from lattice.app.runtime.store import QueuedUpload, RuntimeStore, persist_runtime_state
+from lattice.app.runtime.store import (
+    QueuedUpload,
+    RuntimeStore,
+    record_chunks_add,
+    record_job_upsert,
+    record_upload_dequeue,
+    record_upload_enqueue,
+)
 
 SUPPORTED_CONTENT_TYPES = {
     "text/plain",
@@ -41,7 +48,7 @@ def _chunk_text(
     text: str, chunk_size: int = 600, overlap: int = 120
 ) -> list[tuple[int, int, str]]:
     chunks: list[tuple[int, int, str]] = []
-    if not text.strip():
+    if not text or text.isspace():
         return chunks
     cursor = 0
     while cursor < len(text):
@@ -75,16 +82,18 @@ def enqueue_ingestion_job(
         chunk_count=0,
         error_message=None,
     )
-    store.ingestion_jobs[job_id] = queued
-    store.queued_uploads[job_id] = QueuedUpload(
-        job_id=job_id,
-        user_id=user_id,
-        filename=filename,
-        content_type=content_type,
-        file_bytes=file_bytes,
-        user_access_token=user_access_token,
+    record_job_upsert(store, queued)
+    record_upload_enqueue(
+        store,
+        QueuedUpload(
+            job_id=job_id,
+            user_id=user_id,
+            filename=filename,
+            content_type=content_type,
+            file_bytes=file_bytes,
+            user_access_token=user_access_token,
+        ),
     )
-    persist_runtime_state(store)
     return queued
 
 
@@ -132,7 +141,7 @@ def _build_chunks(
                 chunk_id=chunk_id,
                 content=content,
                 metadata=metadata,
-                embedding=tuple(float(value) for value in vector),
+                embedding=tuple(map(float, vector)),
             )
         )
     return chunks
@@ -147,8 +156,7 @@ def _set_stage(
     error_message: str | None = None,
 ) -> IngestionJob:
     next_job = replace(job, status=status, stage=stage, error_message=error_message)
-    store.ingestion_jobs[job.job_id] = next_job
-    persist_runtime_state(store)
+    record_job_upsert(store, next_job)
     return next_job
 
 
@@ -220,11 +228,10 @@ def process_ingestion_job(
                 stage=INGESTION_STAGE_UPSERTING,
                 status=INGESTION_STATUS_PROCESSING,
             )
-            for chunk in chunks:
-                supabase_store.upsert_chunk(
-                    user_jwt=upload.user_access_token,
-                    chunk=chunk,
-                )
+            supabase_store.upsert_chunks(
+                user_jwt=upload.user_access_token,
+                chunks=chunks,
+            )
         except Exception as exc:
             failed = _set_stage(
                 store=store,
@@ -235,9 +242,9 @@ def process_ingestion_job(
             )
             return failed
 
-    local_chunks = store.private_chunks_by_user.setdefault(upload.user_id, [])
-    local_chunks.extend(chunks)
-    store.queued_uploads.pop(job_id, None)
+    record_chunks_add(store, upload.user_id, chunks)
+    store.document_count_cache.pop(upload.user_id)
+    record_upload_dequeue(store, job_id)
     completed = replace(
         processing,
         status=INGESTION_STATUS_SUCCESS,
@@ -245,8 +252,7 @@ def process_ingestion_job(
         chunk_count=len(chunks),
         error_message=None,
     )
-    store.ingestion_jobs[job_id] = completed
-    persist_runtime_state(store)
+    record_job_upsert(store, completed)
     return completed
 
 
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-import json
 import os
 from dataclasses import dataclass
 
+import orjson
+
 
 @dataclass(frozen=True)
 class CriticDecision:
@@ -73,7 +74,7 @@ class GeminiCriticModel(CriticModel):
         if not isinstance(text, str):
             text = str(response.content)
         try:
-            payload = json.loads(text)
+            payload = orjson.loads(text)
             should_refine = bool(payload.get("should_refine", False))
             reason = str(payload.get("reason", "critic decided"))
             return CriticDecision(should_refine=should_refine, reason=reason)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import re
+
 from lattice.app.memory.contracts import ConversationTurn
 from lattice.app.runtime.store import RuntimeStore
 
@@ -14,6 +16,7 @@ FOLLOW_UP_HINTS = {
     "that result",
     "those findings",
 }
+FOLLOW_UP_HINT_PATTERN = re.compile("|".join(map(re.escape, sorted(FOLLOW_UP_HINTS))))
 
 
 def append_turn(
@@ -43,8 +46,7 @@ def resolve_follow_up_question(
     thread_id: str,
     question: str,
 ) -> tuple[str, str | None]:
-    normalized = question.lower().strip()
-    if not any(hint in normalized for hint in FOLLOW_UP_HINTS):
+    if FOLLOW_UP_HINT_PATTERN.search(question.lower()) is None:
         return question, None
 
     turns = store.conversation_turns_by_thread.get(thread_id, [])
@@ -3,7 +3,9 @@ from __future__ import annotations
 import operator
 import re
 import time
-from typing import Annotated, Literal
+from functools import lru_cache
+from itertools import chain
+from typing import Annotated
 from typing import TypedDict
 
 from lattice.app.graph.neo4j_store import Neo4jGraphStore
@@ -53,22 +55,30 @@ GRAPH_QUERY_PATTERNS = {
     "what rating",
     "release year",
 }
+HYBRID_MERGE_LIMIT = 6
+SINGLE_ROUTE_TARGETS = {
+    "direct": "single_retrieval",
+    "aggregate": "single_retrieval",
+}
 
 
-def _contains_hint(normalized_query: str, hint: str) -> bool:
-    if " " in hint:
-        return hint in normalized_query
-    return bool(re.search(rf"\b{re.escape(hint)}\b", normalized_query))
+def _compile_hints(
+    hints: set[str], *, substrings: set[str] | None = None
+) -> re.Pattern[str]:
+    words = sorted(re.escape(hint) for hint in hints if " " not in hint)
+    phrases = {hint for hint in hints if " " in hint} | (substrings or set())
+    alternatives = [rf"\b(?:{'|'.join(words)})\b"] if words else []
+    alternatives.extend(sorted(map(re.escape, phrases)))
+    return re.compile("|".join(alternatives))
 
 
-def _contains_any_hint(normalized_query: str, hints: set[str]) -> bool:
-    return any(_contains_hint(normalized_query, hint) for hint in hints)
+GRAPH_HINT_PATTERN = _compile_hints(GRAPH_HINTS, substrings=GRAPH_QUERY_PATTERNS)
+DOC_HINT_PATTERN = _compile_hints(DOC_HINTS)
+COUNT_HINT_PATTERN = _compile_hints(COUNT_HINTS)
 
 
-def _is_graph_domain_question(normalized_query: str) -> bool:
-    if any(pattern in normalized_query for pattern in GRAPH_QUERY_PATTERNS):
-        return True
-    return _contains_any_hint(normalized_query, GRAPH_HINTS)
+def _elapsed_ms(started_ns: int) -> int:
+    return (time.perf_counter_ns() - started_ns) // 1_000_000
 
 
 class OrchestrationResult(TypedDict):
@@ -92,10 +102,14 @@ class _GraphState(TypedDict, total=False):
 
 
 def select_route(query: str) -> RouteDecision:
-    normalized = query.lower()
-    has_graph = _is_graph_domain_question(normalized)
-    has_docs = _contains_any_hint(normalized, DOC_HINTS)
-    is_count = _contains_any_hint(normalized, COUNT_HINTS)
+    return _route_for_normalized(query.strip().lower())
+
+
+@lru_cache(maxsize=2048)
+def _route_for_normalized(normalized: str) -> RouteDecision:
+    has_graph = GRAPH_HINT_PATTERN.search(normalized) is not None
+    has_docs = DOC_HINT_PATTERN.search(normalized) is not None
+    is_count = COUNT_HINT_PATTERN.search(normalized) is not None
 
     if is_count:
         return RouteDecision(path="aggregate", reason="count-oriented request")
@@ -168,11 +182,11 @@ def _run_without_langgraph(
     rerank_model: str,
     runtime_key: str | None,
 ) -> OrchestrationResult:
-    router_started = time.perf_counter()
+    router_started = time.perf_counter_ns()
     route_decision = select_route(question)
-    router_latency_ms = int((time.perf_counter() - router_started) * 1000)
+    router_latency_ms = _elapsed_ms(router_started)
 
-    retrieval_started = time.perf_counter()
+    retrieval_started = time.perf_counter_ns()
     retrieval = retrieve(
         store=store,
         route=route_decision.path,
@@ -186,11 +200,11 @@ def _run_without_langgraph(
         rerank_model=rerank_model,
         runtime_key=runtime_key,
     )
-    retrieval_latency_ms = int((time.perf_counter() - retrieval_started) * 1000)
+    retrieval_latency_ms = _elapsed_ms(retrieval_started)
 
-    synthesis_started = time.perf_counter()
+    synthesis_started = time.perf_counter_ns()
     answer = build_answer(question, retrieval)
-    synthesis_latency_ms = int((time.perf_counter() - synthesis_started) * 1000)
+    synthesis_latency_ms = _elapsed_ms(synthesis_started)
     return {
         "route": route_decision.path,
         "route_reason": route_decision.reason,
@@ -338,13 +352,13 @@ def run_orchestration(
     timings: dict[str, int] = {}
 
     def router_node(state: _GraphState) -> _GraphState:
-        started = time.perf_counter()
+        started = time.perf_counter_ns()
         decision = select_route(state["question"])
-        timings["router_ms"] = int((time.perf_counter() - started) * 1000)
+        timings["router_ms"] = _elapsed_ms(started)
         return {"route": decision.path, "route_reason": decision.reason}
 
     def single_retrieval_node(state: _GraphState) -> _GraphState:
-        started = time.perf_counter()
+        started = time.perf_counter_ns()
         retrieval = retrieve(
             store=store,
             route=state["route"],
@@ -358,14 +372,13 @@ def run_orchestration(
             rerank_model=rerank_model,
             runtime_key=runtime_key,
         )
-        timings["retrieval_ms"] = int((time.perf_counter() - started) * 1000)
+        timings["retrieval_ms"] = _elapsed_ms(started)
         return {"retrieval": retrieval}
 
     def document_branch_node(state: _GraphState) -> _GraphState:
-        started = time.perf_counter()
         if state["route"] not in {"document", "hybrid"}:
-            timings["document_branch_ms"] = int((time.perf_counter() - started) * 1000)
-            return {"doc_hits": tuple()}
+            return {"doc_hits": ()}
+        started = time.perf_counter_ns()
         document_bundle = retrieve(
             store=store,
             route="document",
@@ -379,14 +392,13 @@ def run_orchestration(
             rerank_model=rerank_model,
             runtime_key=runtime_key,
         )
-        timings["document_branch_ms"] = int((time.perf_counter() - started) * 1000)
+        timings["document_branch_ms"] = _elapsed_ms(started)
         return {"doc_hits": document_bundle.hits}
 
     def graph_branch_node(state: _GraphState) -> _GraphState:
-        started = time.perf_counter()
         if state["route"] not in {"graph", "hybrid"}:
-            timings["graph_branch_ms"] = int((time.perf_counter() - started) * 1000)
-            return {"graph_hits": tuple()}
+            return {"graph_hits": ()}
+        started = time.perf_counter_ns()
         graph_bundle = retrieve(
             store=store,
             route="graph",
@@ -400,50 +412,46 @@ def run_orchestration(
             rerank_model=rerank_model,
             runtime_key=runtime_key,
         )
-        timings["graph_branch_ms"] = int((time.perf_counter() - started) * 1000)
+        timings["graph_branch_ms"] = _elapsed_ms(started)
         return {"graph_hits": graph_bundle.hits}
 
     def merge_retrieval_node(state: _GraphState) -> _GraphState:
-        started = time.perf_counter()
-        doc_hits = list(state.get("doc_hits", tuple()))
-        graph_hits = list(state.get("graph_hits", tuple()))
-
-        if state["route"] == "document":
-            return {
-                "retrieval": RetrievalBundle(route="document", hits=tuple(doc_hits[:5]))
-            }
-        if state["route"] == "graph":
-            return {
-                "retrieval": RetrievalBundle(route="graph", hits=tuple(graph_hits[:5]))
-            }
+        started = time.perf_counter_ns()
+        route = state["route"]
+        doc_hits = state.get("doc_hits", ())
+        graph_hits = state.get("graph_hits", ())
+
+        if route == "document":
+            return {"retrieval": RetrievalBundle(route=route, hits=doc_hits[:5])}
+        if route == "graph":
+            return {"retrieval": RetrievalBundle(route=route, hits=graph_hits[:5])}
 
         deduped: dict[str, RetrievalHit] = {}
-        ranked = sorted(doc_hits + graph_hits, key=lambda row: row.score, reverse=True)
+        ranked = sorted(
+            chain(doc_hits, graph_hits), key=operator.attrgetter("score"), reverse=True
+        )
         for hit in ranked:
             if hit.source_id not in deduped:
                 deduped[hit.source_id] = hit
-        timings["merge_ms"] = int((time.perf_counter() - started) * 1000)
+                if len(deduped) == HYBRID_MERGE_LIMIT:
+                    break
+        timings["merge_ms"] = _elapsed_ms(started)
         return {
             "retrieval": RetrievalBundle(
                 route="hybrid",
-                hits=tuple(list(deduped.values())[:6]),
+                hits=tuple(deduped.values()),
             )
         }
 
-    def route_mode(state: _GraphState) -> Literal["single", "parallel"]:
-        if state["route"] in {"direct", "aggregate"}:
-            return "single"
-        return "parallel"
-
     def route_targets(state: _GraphState) -> str | list[str]:
-        if route_mode(state) == "single":
-            return "single_retrieval"
-        return ["document_branch", "graph_branch"]
+        return SINGLE_ROUTE_TARGETS.get(
+            state["route"], ["document_branch", "graph_branch"]
+        )
 
     def synthesis_node(state: _GraphState) -> _GraphState:
-        started = time.perf_counter()
+        started = time.perf_counter_ns()
         answer = build_answer(state["question"], state["retrieval"])
-        timings["synthesis_ms"] = int((time.perf_counter() - started) * 1000)
+        timings["synthesis_ms"] = _elapsed_ms(started)
         return {"answer": answer}
 
     graph = StateGraph(_GraphState)
@@ -476,6 +484,9 @@ def run_orchestration(
         }
     )
 
+    document_ms = timings.get("document_branch_ms", 0)
+    graph_ms = timings.get("graph_branch_ms", 0)
+    merge_ms = timings.get("merge_ms", 0)
     initial = {
         "route": output["route"],
         "route_reason": output["route_reason"],
@@ -495,20 +506,20 @@ def run_orchestration(
             ToolDecision(
                 tool_name="document_branch",
                 rationale="parallel document retrieval branch",
-                latency_ms=max(timings.get("document_branch_ms", 0), 0),
-                status="ok" if timings.get("document_branch_ms", 0) > 0 else "skipped",
+                latency_ms=max(document_ms, 0),
+                status="ok" if document_ms > 0 else "skipped",
             ),
             ToolDecision(
                 tool_name="graph_branch",
                 rationale="parallel graph retrieval branch",
-                latency_ms=max(timings.get("graph_branch_ms", 0), 0),
-                status="ok" if timings.get("graph_branch_ms", 0) > 0 else "skipped",
+                latency_ms=max(graph_ms, 0),
+                status="ok" if graph_ms > 0 else "skipped",
             ),
             ToolDecision(
                 tool_name="merge_retrieval",
                 rationale="hybrid merge and dedupe",
-                latency_ms=max(timings.get("merge_ms", 0), 0),
-                status="ok" if timings.get("merge_ms", 0) > 0 else "skipped",
+                latency_ms=max(merge_ms, 0),
+                status="ok" if merge_ms > 0 else "skipped",
             ),
             ToolDecision(
                 tool_name="synthesis",
@@ -556,9 +567,12 @@ def _maybe_refine(
     rerank_model: str,
     runtime_key: str | None,
 ) -> OrchestrationResult:
+    refinement_budget = max(0, max_refinements)
+    if refinement_budget == 0:
+        return initial
+
     current = initial
     decisions = list(current["tool_decisions"])
-    refinement_budget = max(0, max_refinements)
 
     for attempt in range(1, refinement_budget + 1):
         if current["route"] not in {"document", "graph"}:
@@ -576,14 +590,14 @@ def _maybe_refine(
             current["retrieval"].hits[0].score if current["retrieval"].hits else 0.0
         )
         hit_count = len(current["retrieval"].hits)
-        critic_started = time.perf_counter()
+        critic_started = time.perf_counter_ns()
         critique = critic_model.evaluate(
             question=question,
             route=current["route"],
             top_score=top_score,
             hit_count=hit_count,
         )
-        critic_latency_ms = int((time.perf_counter() - critic_started) * 1000)
+        critic_latency_ms = _elapsed_ms(critic_started)
 
         if not critique.should_refine:
             decisions.append(
@@ -596,7 +610,7 @@ def _maybe_refine(
             )
             break
 
-        refine_started = time.perf_counter()
+        refine_started = time.perf_counter_ns()
         refine_route = "hybrid" if current["route"] == "document" else "graph"
         refined_retrieval = retrieve(
             store=store,
@@ -611,7 +625,7 @@ def _maybe_refine(
             rerank_model=rerank_model,
             runtime_key=runtime_key,
         )
-        refine_latency_ms = int((time.perf_counter() - refine_started) * 1000)
+        refine_latency_ms = _elapsed_ms(refine_started)
         refined_answer = build_answer(question, refined_retrieval)
         decisions.append(
             ToolDecision(
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 
 from lattice.app.response.contracts import AnswerEnvelope, Citation
 from lattice.app.retrieval.contracts import RetrievalBundle
 
+ANSWER_CACHE_MAXSIZE = 1024
+
 
 def _confidence_for_score(score: float) -> str:
     if score >= 0.75:
@@ -80,6 +83,14 @@ def _graph_summary(query: str, top_lines: list[str]) -> str:
 
 
 def build_answer(query: str, retrieval: RetrievalBundle) -> AnswerEnvelope:
+    # Only graph summaries read the question; other routes share one answer per
+    # bundle, so paraphrases served from the semantic retrieval cache hit here too.
+    summary_query = query if retrieval.route in {"graph", "hybrid"} else ""
+    return _build_answer(summary_query, retrieval)
+
+
+@lru_cache(maxsize=ANSWER_CACHE_MAXSIZE)
+def _build_answer(query: str, retrieval: RetrievalBundle) -> AnswerEnvelope:
     if retrieval.route == "direct":
         return AnswerEnvelope(
             answer=(
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RetrievalHit:
     source_id: str
     score: float
@@ -19,3 +19,12 @@ class RetrievalBundle:
     degraded: bool = False
     backend_failures: tuple[str, ...] = tuple()
     rerank_strategy: str = "score_normalization_v2"
+
+
+@dataclass(frozen=True)
+class LexicalCorpus:
+    source_ids: tuple[str, ...] = tuple()
+    contents: tuple[str, ...] = tuple()
+    locations: tuple[str, ...] = tuple()
+    tokens: tuple[frozenset[str], ...] = tuple()
+    postings: dict[str, tuple[int, ...]] = field(default_factory=dict)
@@ -4,6 +4,10 @@ import hashlib
 import os
 
 
+class EmbeddingError(Exception):
+    pass
+
+
 class EmbeddingProvider:
     def embed_documents(self, texts: list[str]) -> list[list[float]]:
         raise NotImplementedError
@@ -17,12 +21,13 @@ class DeterministicEmbeddingProvider(EmbeddingProvider):
         self._dimensions = dimensions
 
     def _hash_vector(self, text: str) -> list[float]:
-        required_bytes = max(self._dimensions * 2, 64)
-        digest_source = b""
+        # Chained 32-byte SHA-256 blocks; only the first `dimensions` bytes are used.
+        digests: list[bytes] = []
         seed = text.encode("utf-8")
-        while len(digest_source) < required_bytes:
+        for _ in range((self._dimensions + 31) // 32):
             seed = hashlib.sha256(seed).digest()
-            digest_source += seed
+            digests.append(seed)
+        digest_source = b"".join(digests)
         return [value / 255.0 for value in digest_source[: self._dimensions]]
 
     def embed_documents(self, texts: list[str]) -> list[list[float]]:
@@ -60,10 +65,18 @@ class GoogleGenerativeAIEmbeddingProvider(EmbeddingProvider):
         )
 
     def embed_documents(self, texts: list[str]) -> list[list[float]]:
-        return [list(row) for row in self._embeddings.embed_documents(texts)]
+        try:
+            rows = self._embeddings.embed_documents(texts)
+        except Exception as exc:
+            raise EmbeddingError(str(exc)) from exc
+        return [list(row) for row in rows]
 
     def embed_query(self, text: str) -> list[float]:
-        return list(self._query_embeddings.embed_query(text))
+        try:
+            vector = self._query_embeddings.embed_query(text)
+        except Exception as exc:
+            raise EmbeddingError(str(exc)) from exc
+        return list(vector)
 
 
 def build_runtime_embedding_provider(
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import re
+import sys
+from functools import lru_cache
+
+from lattice.app.graph.contracts import GraphEdge
+from lattice.app.retrieval.contracts import LexicalCorpus
+
+
+@lru_cache(maxsize=8192)
+def content_tokens(content: str) -> frozenset[str]:
+    # Interned tokens let query/corpus set intersections match by identity.
+    return frozenset(map(sys.intern, content.lower().split()))
+
+
+def stable_edge_source_id(source: str, relationship: str, target: str) -> str:
+    normalized = re.sub(
+        r"[^a-z0-9]+",
+        "-",
+        f"{source.lower()}-{relationship.lower()}-{target.lower()}",
+    ).strip("-")
+    return f"graph-edge:{normalized or 'unknown'}"
+
+
+def _build_postings(
+    tokens_by_record: tuple[frozenset[str], ...],
+) -> dict[str, tuple[int, ...]]:
+    postings: dict[str, list[int]] = {}
+    for index, tokens in enumerate(tokens_by_record):
+        for token in tokens:
+            postings.setdefault(token, []).append(index)
+    return {token: tuple(indices) for token, indices in postings.items()}
+
+
+def build_demo_document_corpus(documents: list[dict[str, str]]) -> LexicalCorpus:
+    tokens = tuple(content_tokens(document["content"]) for document in documents)
+    return LexicalCorpus(
+        source_ids=tuple(document["chunk_id"] for document in documents),
+        contents=tuple(document["content"] for document in documents),
+        locations=tuple(document["source"] for document in documents),
+        tokens=tokens,
+        postings=_build_postings(tokens),
+    )
+
+
+def build_graph_edge_corpus(edges: list[GraphEdge]) -> LexicalCorpus:
+    contents = tuple(
+        f"{edge.source} {edge.relationship} {edge.target}. Evidence: {edge.evidence}"
+        for edge in edges
+    )
+    tokens = tuple(content_tokens(content) for content in contents)
+    return LexicalCorpus(
+        source_ids=tuple(
+            stable_edge_source_id(edge.source, edge.relationship, edge.target)
+            for edge in edges
+        ),
+        contents=contents,
+        locations=tuple(
+            f"{edge.source}-{edge.relationship}-{edge.target}" for edge in edges
+        ),
+        tokens=tokens,
+        postings=_build_postings(tokens),
+    )
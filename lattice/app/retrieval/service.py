@@ -1,52 +1,78 @@
 from __future__ import annotations
 
-import json
+import heapq
+import logging
+import math
+import operator
 import re
-from collections import OrderedDict
+from array import array
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
 
 from lattice.app.graph.neo4j_store import Neo4jGraphStore
-from lattice.app.retrieval.contracts import RetrievalBundle, RetrievalHit
-from lattice.app.retrieval.embeddings import EmbeddingProvider
+from lattice.app.retrieval.contracts import (
+    LexicalCorpus,
+    RetrievalBundle,
+    RetrievalHit,
+)
+from lattice.app.retrieval.embeddings import EmbeddingError, EmbeddingProvider
+from lattice.app.retrieval.lexical import content_tokens
 from lattice.app.retrieval.supabase_store import SupabaseVectorStore
-from lattice.app.runtime.store import RuntimeStore
-
-STOP_WORDS = {
-    "a",
-    "an",
-    "and",
-    "are",
-    "for",
-    "from",
-    "in",
-    "is",
-    "of",
-    "on",
-    "the",
-    "to",
-    "with",
-}
-
-
-def _stable_edge_source_id(source: str, relationship: str, target: str) -> str:
-    normalized = re.sub(
-        r"[^a-z0-9]+",
-        "-",
-        f"{source.lower()}-{relationship.lower()}-{target.lower()}",
-    ).strip("-")
-    return f"graph-edge:{normalized or 'unknown'}"
-
-
-def _token_overlap_score(query: str, content: str) -> float:
-    query_tokens = {token for token in query.lower().split() if token}
-    content_tokens = {token for token in content.lower().split() if token}
+from lattice.app.runtime.store import RuntimeStore, SemanticCacheEntry
+
+STOP_WORDS = frozenset(
+    {
+        "a",
+        "an",
+        "and",
+        "are",
+        "for",
+        "from",
+        "in",
+        "is",
+        "of",
+        "on",
+        "the",
+        "to",
+        "with",
+    }
+)
+SEMANTIC_KEY_STRIP_PATTERN = re.compile(r"[^a-z0-9\s]")
+HEURISTIC_SEMANTIC_WEIGHT = 0.7
+RRF_RANK_CONSTANT = 60
+SEMANTIC_CACHE_MIN_SIMILARITY = 0.97
+SEMANTIC_CACHE_PREFIX_DIMS = 64
+# For unit vectors |a - b|^2 = 2 - 2 * (a . b); the slack absorbs float32
+# rounding of the stored norms.
+SEMANTIC_CACHE_MAX_DISTANCE = math.sqrt(2 * (1 - SEMANTIC_CACHE_MIN_SIMILARITY) + 1e-4)
+LLM_RERANK_MAX_CANDIDATES = 12
+LLM_RERANK_CONTENT_CHARS = 400
+LLM_RERANK_CLIENT_CACHE_MAXSIZE = 32
+GRAPH_EDGE_COUNT_CACHE_KEY = "shared"
+
+logger = logging.getLogger(__name__)
+_hit_score = operator.attrgetter("score")
+_backend_executor = ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix="retrieval-backend"
+)
+
+
+def _token_overlap_score(
+    query_tokens: frozenset[str], document_tokens: frozenset[str]
+) -> float:
     if not query_tokens:
         return 0.0
-    overlap = len(query_tokens.intersection(content_tokens))
+    overlap = len(query_tokens.intersection(document_tokens))
     return overlap / len(query_tokens)
 
 
 def _semantic_query_key(query: str) -> str:
-    normalized = re.sub(r"[^a-z0-9\s]", " ", query.lower())
+    normalized = SEMANTIC_KEY_STRIP_PATTERN.sub(" ", query.lower())
     tokens = [
         token for token in normalized.split() if token and token not in STOP_WORDS
     ]
@@ -55,36 +81,43 @@ def _semantic_query_key(query: str) -> str:
     return " ".join(sorted(tokens))
 
 
-def _normalize_scores(values: list[float]) -> dict[float, float]:
-    if not values:
-        return {}
+def _min_max_normalize(values: list[float], *, flat_score: float = 1.0) -> list[float]:
     minimum = min(values)
     maximum = max(values)
     if maximum <= minimum:
-        return {value: 1.0 for value in values}
-    return {value: (value - minimum) / (maximum - minimum) for value in values}
+        return [flat_score] * len(values)
+    spread = maximum - minimum
+    return [(value - minimum) / spread for value in values]
 
 
 def _heuristic_rerank_hits(
-    query: str, hits: list[RetrievalHit], limit: int
+    query: str,
+    hits: list[RetrievalHit],
+    limit: int,
+    *,
+    semantic_weight: float = HEURISTIC_SEMANTIC_WEIGHT,
 ) -> list[RetrievalHit]:
     if not hits:
         return []
 
-    score_map_by_source_type: dict[str, dict[float, float]] = {}
-    grouped_scores: dict[str, list[float]] = {}
-    for hit in hits:
-        grouped_scores.setdefault(hit.source_type, []).append(hit.score)
-    for source_type, scores in grouped_scores.items():
-        score_map_by_source_type[source_type] = _normalize_scores(scores)
+    semantic_scores = _min_max_normalize([hit.score for hit in hits])
+    query_tokens = content_tokens(query)
+    raw_lexical_scores = [
+        _token_overlap_score(query_tokens, content_tokens(hit.content)) for hit in hits
+    ]
+    # Identical overlaps carry no ranking signal; keep their absolute value.
+    lexical_scores = _min_max_normalize(
+        raw_lexical_scores, flat_score=raw_lexical_scores[0]
+    )
+    lexical_weight = 1.0 - semantic_weight
 
     reranked: list[RetrievalHit] = []
-    for hit in hits:
-        semantic_score = score_map_by_source_type.get(hit.source_type, {}).get(
-            hit.score, 0.0
+    for hit, semantic_score, lexical_score in zip(
+        hits, semantic_scores, lexical_scores
+    ):
+        final_score = (semantic_weight * semantic_score) + (
+            lexical_weight * lexical_score
         )
-        lexical_score = _token_overlap_score(query, hit.content)
-        final_score = (0.7 * semantic_score) + (0.3 * lexical_score)
         reranked.append(
             RetrievalHit(
                 source_id=hit.source_id,
@@ -96,34 +129,63 @@ def _heuristic_rerank_hits(
         )
 
     deduped: OrderedDict[str, RetrievalHit] = OrderedDict()
-    for hit in sorted(reranked, key=lambda row: row.score, reverse=True):
+    for hit in sorted(reranked, key=_hit_score, reverse=True):
         deduped.setdefault(hit.source_id, hit)
     return list(deduped.values())[:limit]
 
 
-def _extract_json_payload(text: str) -> str:
-    stripped = text.strip()
-    if stripped.startswith("```"):
-        stripped = re.sub(r"^```(?:json)?", "", stripped).strip()
-        stripped = re.sub(r"```$", "", stripped).strip()
-    return stripped
-
-
-def _llm_rerank_hits(
-    *,
-    query: str,
-    hits: list[RetrievalHit],
+def _rrf_fuse(
+    lists: list[list[RetrievalHit]],
     limit: int,
-    runtime_key: str,
-    model: str,
+    k: int = RRF_RANK_CONSTANT,
 ) -> list[RetrievalHit]:
-    if not hits:
+    fused_scores: dict[str, float] = {}
+    appearances: dict[str, int] = {}
+    first_seen: dict[str, RetrievalHit] = {}
+    for hits in lists:
+        for rank, hit in enumerate(hits, start=1):
+            fused_scores[hit.source_id] = fused_scores.get(hit.source_id, 0.0) + (
+                1.0 / (k + rank)
+            )
+            appearances[hit.source_id] = appearances.get(hit.source_id, 0) + 1
+            first_seen.setdefault(hit.source_id, hit)
+    if not fused_scores:
         return []
 
+    # Scale against the lists the top hit actually appears in, so a hit ranked
+    # first by the only backend that found it still scores 1.0.
+    top_source_id = max(fused_scores, key=fused_scores.__getitem__)
+    best_possible = appearances[top_source_id] / (k + 1)
+    fused = [
+        RetrievalHit(
+            source_id=source_id,
+            score=round(score / best_possible, 6),
+            content=first_seen[source_id].content,
+            source_type=first_seen[source_id].source_type,
+            location=first_seen[source_id].location,
+        )
+        for source_id, score in fused_scores.items()
+    ]
+    return heapq.nlargest(limit, fused, key=_hit_score)
+
+
+class _RerankRow(BaseModel):
+    i: int
+    score: float
+
+
+class _RerankResponse(BaseModel):
+    rows: list[_RerankRow]
+
+
+@lru_cache(maxsize=LLM_RERANK_CLIENT_CACHE_MAXSIZE)
+def _rerank_client(model: str, runtime_key: str) -> Any:
+    # Building the chat model and its structured-output schema is costly, so
+    # one client is reused per model and key.
     try:
         from langchain_google_genai import ChatGoogleGenerativeAI
     except Exception:
-        return []
+        return None
 
     client = ChatGoogleGenerativeAI(
         model=model,
@@ -131,60 +193,65 @@ def _llm_rerank_hits(
         temperature=0.0,
         max_retries=1,
     )
+    return client.with_structured_output(_RerankResponse)
+
+
+def _llm_rerank_hits(
+    *,
+    query: str,
+    hits: list[RetrievalHit],
+    limit: int,
+    runtime_key: str,
+    model: str,
+) -> list[RetrievalHit]:
+    if not hits:
+        return []
+
+    candidate_hits = hits[:LLM_RERANK_MAX_CANDIDATES]
+    # Candidates are addressed by list index and carry only the text the model
+    # ranks on, keeping prefill small.
     candidates = [
-        {
-            "source_id": hit.source_id,
-            "source_type": hit.source_type,
-            "location": hit.location,
-            "content": hit.content[:900],
-        }
-        for hit in hits[:12]
+        {"i": index, "t": hit.content[:LLM_RERANK_CONTENT_CHARS]}
+        for index, hit in enumerate(candidate_hits)
     ]
     prompt = (
-        "You are a retrieval reranker. Return strict JSON array rows with keys "
-        "source_id and score (0-1). Keep only provided source_ids. "
+        "You are a retrieval reranker. For each useful candidate return a row "
+        "with its index i and a score (0-1). Keep only provided indices. "
         "Rank by usefulness for answering the query with grounded evidence. "
         f"Query: {query}\n"
-        f"Candidates: {json.dumps(candidates)}"
+        f"Candidates: {orjson.dumps(candidates).decode()}"
     )
 
     try:
-        response = client.invoke(prompt)
-        text = getattr(response, "text", None)
-        if not isinstance(text, str):
-            text = str(response.content)
-        payload = json.loads(_extract_json_payload(text))
-        if not isinstance(payload, list):
+        structured_client = _rerank_client(model, runtime_key)
+        if structured_client is None:
+            return []
+        response = structured_client.invoke(prompt)
+        if not isinstance(response, _RerankResponse):
             return []
     except Exception:
         return []
 
-    score_by_id: dict[str, float] = {}
-    for row in payload:
-        if not isinstance(row, dict):
-            continue
-        source_id = row.get("source_id")
-        score = row.get("score")
-        if isinstance(source_id, str) and isinstance(score, (int, float)):
-            bounded = max(0.0, min(1.0, float(score)))
-            score_by_id[source_id] = bounded
+    score_by_index: dict[int, float] = {}
+    for row in response.rows:
+        if 0 <= row.i < len(candidate_hits):
+            score_by_index[row.i] = max(0.0, min(1.0, row.score))
 
     reranked = [
         RetrievalHit(
-            source_id=hit.source_id,
-            score=round(score_by_id.get(hit.source_id, 0.0), 6),
-            content=hit.content,
-            source_type=hit.source_type,
-            location=hit.location,
+            source_id=candidate_hits[index].source_id,
+            score=round(score, 6),
+            content=candidate_hits[index].content,
+            source_type=candidate_hits[index].source_type,
+            location=candidate_hits[index].location,
         )
-        for hit in hits
-        if hit.source_id in score_by_id
+        for index, score in score_by_index.items()
     ]
     if not reranked:
         return []
 
     deduped: OrderedDict[str, RetrievalHit] = OrderedDict()
-    for hit in sorted(reranked, key=lambda row: row.score, reverse=True):
+    for hit in sorted(reranked, key=_hit_score, reverse=True):
         deduped.setdefault(hit.source_id, hit)
     return list(deduped.values())[:limit]
 
@@ -215,66 +282,75 @@ def _fallback_document_hits(
     store: RuntimeStore,
     user_id: str | None,
     query: str,
+    limit: int,
 ) -> list[RetrievalHit]:
-    hits: list[RetrievalHit] = []
-    if user_id:
-        for chunk in store.private_chunks_by_user.get(user_id, []):
-            score = _token_overlap_score(query, chunk.content)
-            if score <= 0:
-                continue
-            hits.append(
-                RetrievalHit(
-                    source_id=chunk.chunk_id,
-                    score=score,
-                    content=chunk.content,
-                    source_type="private_document",
-                    location=(
-                        f"{chunk.metadata.source}:page={chunk.metadata.page}:"
-                        f"{chunk.metadata.offset_start}-{chunk.metadata.offset_end}"
-                    ),
-                )
-            )
-    else:
-        for chunk in store.shared_demo_documents:
-            score = _token_overlap_score(query, chunk["content"])
-            if score <= 0:
-                continue
-            hits.append(
-                RetrievalHit(
-                    source_id=chunk["chunk_id"],
-                    score=score,
-                    content=chunk["content"],
-                    source_type="demo_document",
-                    location=chunk["source"],
-                )
-            )
-    return sorted(hits, key=lambda row: row.score, reverse=True)
-
+    if not user_id:
+        return _corpus_hits(
+            store.shared_demo_corpus,
+            query=query,
+            source_type="demo_document",
+            limit=limit,
+        )
 
-def _fallback_graph_hits(store: RuntimeStore, query: str) -> list[RetrievalHit]:
     hits: list[RetrievalHit] = []
-    for edge in store.shared_graph_edges:
-        content = (
-            f"{edge.source} {edge.relationship} {edge.target}. "
-            f"Evidence: {edge.evidence}"
-        )
-        score = _token_overlap_score(query, content)
+    query_tokens = content_tokens(query)
+    for chunk in store.private_chunks_by_user.get(user_id, []):
+        score = _token_overlap_score(query_tokens, content_tokens(chunk.content))
         if score <= 0:
             continue
         hits.append(
             RetrievalHit(
-                source_id=_stable_edge_source_id(
-                    edge.source,
-                    edge.relationship,
-                    edge.target,
-                ),
+                source_id=chunk.chunk_id,
                 score=score,
-                content=content,
-                source_type="shared_graph",
-                location=f"{edge.source}-{edge.relationship}-{edge.target}",
+                content=chunk.content,
+                source_type="private_document",
+                location=(
+                    f"{chunk.metadata.source}:page={chunk.metadata.page}:"
+                    f"{chunk.metadata.offset_start}-{chunk.metadata.offset_end}"
+                ),
             )
         )
-    return sorted(hits, key=lambda row: row.score, reverse=True)
+    return heapq.nlargest(limit, hits, key=_hit_score)
+
+
+def _corpus_hits(
+    corpus: LexicalCorpus,
+    *,
+    query: str,
+    source_type: str,
+    limit: int,
+) -> list[RetrievalHit]:
+    query_tokens = content_tokens(query)
+    if not query_tokens:
+        return []
+    # Each posting a record appears in is one overlapping query token, so the
+    # counts are the overlap sizes and only the top records become hits.
+    overlaps: Counter[int] = Counter()
+    for token in query_tokens:
+        overlaps.update(corpus.postings.get(token, ()))
+    top = heapq.nlargest(limit, overlaps.items(), key=lambda item: (item[1], -item[0]))
+
+    return [
+        RetrievalHit(
+            source_id=corpus.source_ids[index],
+            score=overlap / len(query_tokens),
+            content=corpus.contents[index],
+            source_type=source_type,
+            location=corpus.locations[index],
+        )
+        for index, overlap in top
+    ]
+
+
+def _fallback_graph_hits(
+    store: RuntimeStore, query: str, limit: int
+) -> list[RetrievalHit]:
+    return _corpus_hits(
+        store.shared_graph_corpus,
+        query=query,
+        source_type="shared_graph",
+        limit=limit,
+    )
 
 
 def _query_embedding(
@@ -285,11 +361,59 @@ def _query_embedding(
 ) -> list[float]:
     semantic_key = _semantic_query_key(query)
     cached = store.query_embedding_cache.get(semantic_key)
-    if cached is not None:
-        return list(cached)
-    vector = embedding_provider.embed_query(query)
-    store.query_embedding_cache[semantic_key] = tuple(vector)
-    return vector
+    if cached is None:
+        # float32 storage keeps a 1536-d vector at ~6 KB instead of ~49 KB.
+        cached = array("f", embedding_provider.embed_query(query))
+        store.query_embedding_cache[semantic_key] = cached
+    return cached.tolist()
+
+
+def _unit_vector(values: list[float]) -> array:
+    norm = math.sqrt(sum(value * value for value in values))
+    if norm == 0:
+        return array("f", values)
+    return array("f", (value / norm for value in values))
+
+
+def _vector_prefix(unit_vector: array) -> tuple[float, ...]:
+    return tuple(unit_vector[:SEMANTIC_CACHE_PREFIX_DIMS])
+
+
+def _semantic_cache_lookup(
+    *,
+    store: RuntimeStore,
+    scope: str,
+    unit_vector: array,
+) -> RetrievalBundle | None:
+    best_similarity = SEMANTIC_CACHE_MIN_SIMILARITY
+    best_bundle: RetrievalBundle | None = None
+    prefix = _vector_prefix(unit_vector)
+    for entry in store.semantic_retrieval_cache.values():
+        if entry.scope != scope or len(entry.unit_vector) != len(unit_vector):
+            continue
+        # The distance over the leading dimensions never exceeds the full
+        # distance, so most entries are rejected without the full dot product.
+        if math.dist(entry.prefix, prefix) > SEMANTIC_CACHE_MAX_DISTANCE:
+            continue
+        similarity = sum(map(operator.mul, entry.unit_vector, unit_vector))
+        if similarity >= best_similarity:
+            best_similarity = similarity
+            best_bundle = entry.bundle
+    return best_bundle
+
+
+def _uses_query_embedding(
+    *,
+    route: str,
+    user_id: str | None,
+    user_access_token: str | None,
+    supabase_store: SupabaseVectorStore | None,
+) -> bool:
+    return (
+        route in {"document", "hybrid"}
+        and bool(user_id and user_access_token)
+        and supabase_store is not None
+    )
 
 
 def _document_hits(
@@ -322,8 +446,10 @@ def _document_hits(
         except Exception as exc:
             backend_failures.append(f"supabase:{exc.__class__.__name__}")
 
-    fallback_hits = _fallback_document_hits(store=store, user_id=user_id, query=query)
-    return fallback_hits[:limit], backend_failures
+    fallback_hits = _fallback_document_hits(
+        store=store, user_id=user_id, query=query, limit=limit
+    )
+    return fallback_hits, backend_failures
 
 
 def _graph_hits(
@@ -336,15 +462,22 @@ def _graph_hits(
     backend_failures: list[str] = []
 
     if neo4j_store:
+        # Graph data is shared across users and routes, so identical queries
+        # reuse one database round trip regardless of who asked.
+        cache_key = f"{limit}:{query.strip().lower()}"
+        cached = store.graph_search_cache.get(cache_key)
+        if cached is not None:
+            return list(cached), backend_failures
         try:
             hits = neo4j_store.search(query=query, limit=limit)
             if hits:
+                store.graph_search_cache[cache_key] = tuple(hits[:limit])
                 return hits[:limit], backend_failures
         except Exception as exc:
             backend_failures.append(f"neo4j:{exc.__class__.__name__}")
 
-    fallback_hits = _fallback_graph_hits(store=store, query=query)
-    return fallback_hits[:limit], backend_failures
+    fallback_hits = _fallback_graph_hits(store=store, query=query, limit=limit)
+    return fallback_hits, backend_failures
 
 
 def _count_documents(
@@ -356,10 +489,13 @@ def _count_documents(
 ) -> tuple[int, list[str]]:
     backend_failures: list[str] = []
     if user_id and user_access_token and supabase_store:
+        cached = store.document_count_cache.get(user_id)
+        if cached is not None:
+            return cached, backend_failures
         try:
-            return supabase_store.count_chunks(
-                user_jwt=user_access_token
-            ), backend_failures
+            count = supabase_store.count_chunks(user_jwt=user_access_token)
+            store.document_count_cache[user_id] = count
+            return count, backend_failures
         except Exception as exc:
             backend_failures.append(f"supabase:{exc.__class__.__name__}")
 
@@ -375,8 +511,13 @@ def _count_graph_edges(
 ) -> tuple[int, list[str]]:
     backend_failures: list[str] = []
     if neo4j_store:
+        cached = store.graph_edge_count_cache.get(GRAPH_EDGE_COUNT_CACHE_KEY)
+        if cached is not None:
+            return cached, backend_failures
         try:
-            return neo4j_store.count_edges(), backend_failures
+            count = neo4j_store.count_edges()
+            store.graph_edge_count_cache[GRAPH_EDGE_COUNT_CACHE_KEY] = count
+            return count, backend_failures
         except Exception as exc:
             backend_failures.append(f"neo4j:{exc.__class__.__name__}")
     return len(store.shared_graph_edges), backend_failures
@@ -398,10 +539,45 @@ def retrieve(
 ) -> RetrievalBundle:
     semantic_key = _semantic_query_key(query)
     cache_key = f"{route}:{user_id}:{semantic_key}:{rerank_backend}:{rerank_model}"
-    cached = store.retrieval_cache.get(cache_key)
+    # Aggregate answers are served from the short-lived count caches instead,
+    # so they never outlive a count change by more than the count TTL.
+    cached = store.retrieval_cache.get(cache_key) if route != "aggregate" else None
     if cached is not None:
         return cached
 
+    # Paraphrases miss the exact key; reuse a bundle whose query embedding is
+    # near-identical. Only done when the route embeds the query anyway.
+    scope = f"{route}:{user_id}:{rerank_backend}:{rerank_model}"
+    query_unit_vector: array | None = None
+    if _uses_query_embedding(
+        route=route,
+        user_id=user_id,
+        user_access_token=user_access_token,
+        supabase_store=supabase_store,
+    ):
+        try:
+            query_unit_vector = _unit_vector(
+                _query_embedding(
+                    store=store,
+                    embedding_provider=embedding_provider,
+                    query=query,
+                )
+            )
+        except EmbeddingError:
+            logger.debug(
+                "Query embedding failed; skipping semantic cache", exc_info=True
+            )
+            query_unit_vector = None
+    if query_unit_vector is not None:
+        similar = _semantic_cache_lookup(
+            store=store,
+            scope=scope,
+            unit_vector=query_unit_vector,
+        )
+        if similar is not None:
+            store.retrieval_cache[cache_key] = similar
+            return similar
+
     backend_failures: list[str] = []
 
     if route == "graph":
@@ -454,6 +630,18 @@ def retrieve(
             rerank_strategy=rerank_strategy,
         )
     elif route == "hybrid":
+        # With both remote backends configured, overlap the two retrieval calls.
+        graph_search = (
+            _backend_executor.submit(
+                _graph_hits,
+                store=store,
+                query=query,
+                neo4j_store=neo4j_store,
+                limit=10,
+            )
+            if neo4j_store and supabase_store
+            else None
+        )
         doc_hits, doc_failures = _document_hits(
             store=store,
             query=query,
@@ -463,23 +651,30 @@ def retrieve(
             supabase_store=supabase_store,
             limit=10,
         )
-        graph_hits, graph_failures = _graph_hits(
-            store=store,
-            query=query,
-            neo4j_store=neo4j_store,
-            limit=10,
+        graph_hits, graph_failures = (
+            graph_search.result()
+            if graph_search
+            else _graph_hits(
+                store=store, query=query, neo4j_store=neo4j_store, limit=10
+            )
         )
         backend_failures.extend(doc_failures)
         backend_failures.extend(graph_failures)
-        combined = doc_hits + graph_hits
-        reranked, rerank_strategy = _rerank_hits(
-            query=query,
-            hits=combined,
-            limit=6,
-            backend=rerank_backend,
-            runtime_key=runtime_key,
-            model=rerank_model,
-        )
+        reranked: list[RetrievalHit] = []
+        if rerank_backend == "llm" and runtime_key:
+            reranked = _llm_rerank_hits(
+                query=query,
+                hits=doc_hits + graph_hits,
+                limit=6,
+                runtime_key=runtime_key,
+                model=rerank_model,
+            )
+        if reranked:
+            rerank_strategy = "llm_rerank_v1"
+        else:
+            # Document and graph scores live on different scales; fuse by rank.
+            reranked = _rrf_fuse([doc_hits, graph_hits], limit=6)
+            rerank_strategy = "reciprocal_rank_fusion_v1"
         result = RetrievalBundle(
             route=route,
             hits=tuple(reranked),
@@ -488,15 +683,24 @@ def retrieve(
             rerank_strategy=rerank_strategy,
         )
     elif route == "aggregate":
+        # With both remote backends configured, overlap the two count round trips.
+        graph_count = (
+            _backend_executor.submit(
+                _count_graph_edges, store=store, neo4j_store=neo4j_store
+            )
+            if neo4j_store and supabase_store
+            else None
+        )
         document_count, doc_failures = _count_documents(
             store=store,
             user_id=user_id,
             user_access_token=user_access_token,
             supabase_store=supabase_store,
         )
-        graph_edge_count, graph_failures = _count_graph_edges(
-            store=store,
-            neo4j_store=neo4j_store,
+        graph_edge_count, graph_failures = (
+            graph_count.result()
+            if graph_count
+            else _count_graph_edges(store=store, neo4j_store=neo4j_store)
         )
         backend_failures.extend(doc_failures)
         backend_failures.extend(graph_failures)
@@ -526,5 +730,13 @@ def retrieve(
             rerank_strategy="none",
         )
 
-    store.retrieval_cache[cache_key] = result
+    if route != "aggregate":
+        store.retrieval_cache[cache_key] = result
+    if query_unit_vector is not None:
+        store.semantic_retrieval_cache[cache_key] = SemanticCacheEntry(
+            scope=scope,
+            unit_vector=query_unit_vector,
+            bundle=result,
+            prefix=_vector_prefix(query_unit_vector),
+        )
     return result
@@ -1,22 +1,64 @@
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import httpx
+import orjson
 
 from lattice.app.ingestion.contracts import DocumentChunk
 from lattice.app.retrieval.contracts import RetrievalHit
 
+# Rows per upsert_embedding_chunks call, keeping request bodies and statements
+# bounded for large documents.
+UPSERT_BATCH_SIZE = 100
+
 
 def _vector_literal(values: list[float]) -> str:
     return "[" + ",".join(f"{value:.8f}" for value in values) + "]"
 
 
+def _chunk_location(source: str, metadata: object) -> str:
+    if not isinstance(metadata, dict):
+        return source
+    page = metadata.get("page")
+    offset_start = metadata.get("offset_start")
+    offset_end = metadata.get("offset_end")
+    if not all(isinstance(value, int) for value in (page, offset_start, offset_end)):
+        return source
+    return f"{source}:page={page}:{offset_start}-{offset_end}"
+
+
+def _chunk_row(chunk: DocumentChunk) -> dict[str, object]:
+    return {
+        "p_id": chunk.chunk_id,
+        "p_user_id": chunk.metadata.user_id,
+        "p_source": chunk.metadata.source,
+        "p_chunk_id": chunk.chunk_id,
+        "p_content": chunk.content,
+        "p_metadata": {
+            "page": chunk.metadata.page,
+            "offset_start": chunk.metadata.offset_start,
+            "offset_end": chunk.metadata.offset_end,
+            "user_id": chunk.metadata.user_id,
+            "source": chunk.metadata.source,
+        },
+        "p_embedding": _vector_literal(list(chunk.embedding)),
+    }
+
+
 @dataclass(frozen=True)
 class SupabaseVectorStore:
     url: str
     anon_key: str
+    _client: httpx.Client = field(
+        default_factory=lambda: httpx.Client(timeout=20.0),
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    def close(self) -> None:
+        self._client.close()
 
     @property
     def _rpc_url(self) -> str:
@@ -29,42 +71,38 @@ class SupabaseVectorStore:
             "Content-Type": "application/json",
         }
 
-    def upsert_chunk(self, *, user_jwt: str, chunk: DocumentChunk) -> None:
-        payload = {
-            "p_id": chunk.chunk_id,
-            "p_user_id": chunk.metadata.user_id,
-            "p_source": chunk.metadata.source,
-            "p_chunk_id": chunk.chunk_id,
-            "p_content": chunk.content,
-            "p_metadata": {
-                "page": chunk.metadata.page,
-                "offset_start": chunk.metadata.offset_start,
-                "offset_end": chunk.metadata.offset_end,
-                "user_id": chunk.metadata.user_id,
-                "source": chunk.metadata.source,
-            },
-            "p_embedding": _vector_literal(list(chunk.embedding)),
-        }
-
-        endpoint = f"{self._rpc_url}/upsert_embedding_chunk"
-        with httpx.Client(timeout=20.0) as client:
-            response = client.post(
-                endpoint,
-                headers=self._headers(user_jwt),
-                content=json.dumps(payload),
+    def upsert_chunks(self, *, user_jwt: str, chunks: list[DocumentChunk]) -> None:
+        rows = [_chunk_row(chunk) for chunk in chunks]
+        headers = self._headers(user_jwt)
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            response = self._client.post(
+                f"{self._rpc_url}/upsert_embedding_chunks",
+                headers=headers,
+                content=orjson.dumps(
+                    {"p_chunks": rows[start : start + UPSERT_BATCH_SIZE]}
+                ),
             )
-        response.raise_for_status()
+            if response.status_code == 404:
+                # Databases set up before supabase_phase2_schema.sql added the
+                # batch RPC only have the per-chunk one.
+                for row in rows[start:]:
+                    self._client.post(
+                        f"{self._rpc_url}/upsert_embedding_chunk",
+                        headers=headers,
+                        content=orjson.dumps(row),
+                    ).raise_for_status()
+                return
+            response.raise_for_status()
 
     def count_chunks(self, *, user_jwt: str) -> int:
         endpoint = f"{self.url.rstrip('/')}/rest/v1/embeddings"
         headers = self._headers(user_jwt)
         headers["Prefer"] = "count=exact"
-        with httpx.Client(timeout=20.0) as client:
-            response = client.get(
-                endpoint,
-                headers=headers,
-                params={"select": "id", "limit": "1"},
-            )
+        response = self._client.head(
+            endpoint,
+            headers=headers,
+            params={"select": "id"},
+        )
         response.raise_for_status()
 
         content_range = response.headers.get("content-range", "")
@@ -87,48 +125,38 @@ class SupabaseVectorStore:
             "match_threshold": match_threshold,
         }
         endpoint = f"{self._rpc_url}/match_embeddings"
-        with httpx.Client(timeout=20.0) as client:
-            response = client.post(
-                endpoint,
-                headers=self._headers(user_jwt),
-                content=json.dumps(payload),
-            )
+        response = self._client.post(
+            endpoint,
+            headers=self._headers(user_jwt),
+            content=orjson.dumps(payload),
+        )
         response.raise_for_status()
-        rows = response.json()
+        rows = orjson.loads(response.content)
         if not isinstance(rows, list):
             return []
 
         hits: list[RetrievalHit] = []
         for row in rows:
-            if not isinstance(row, dict):
-                continue
-            chunk_id = row.get("chunk_id")
-            content = row.get("content")
-            source = row.get("source")
-            similarity = row.get("similarity")
-            metadata = row.get("metadata")
-            if not isinstance(chunk_id, str) or not isinstance(content, str):
+            try:
+                chunk_id = row["chunk_id"]
+                content = row["content"]
+                source = row["source"]
+                similarity = float(row["similarity"])
+            except (KeyError, TypeError, ValueError):
                 continue
-            if not isinstance(source, str) or not isinstance(similarity, (int, float)):
+            if not (
+                isinstance(chunk_id, str)
+                and isinstance(content, str)
+                and isinstance(source, str)
+            ):
                 continue
-            location = source
-            if isinstance(metadata, dict):
-                page = metadata.get("page")
-                offset_start = metadata.get("offset_start")
-                offset_end = metadata.get("offset_end")
-                if (
-                    isinstance(page, int)
-                    and isinstance(offset_start, int)
-                    and isinstance(offset_end, int)
-                ):
-                    location = f"{source}:page={page}:{offset_start}-{offset_end}"
             hits.append(
                 RetrievalHit(
                     source_id=chunk_id,
-                    score=float(similarity),
+                    score=similarity,
                     content=content,
                     source_type="private_document",
-                    location=location,
+                    location=_chunk_location(source, row.get("metadata")),
                 )
             )
         return hits
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class BoundedCache(Generic[K, V]):
+    def __init__(self, *, maxsize: int, ttl_seconds: float | None = None) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self._maxsize = maxsize
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _is_expired(self, stored_at: float, now: float) -> bool:
+        return self._ttl_seconds is not None and now - stored_at >= self._ttl_seconds
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            stored_at, value = entry
+            if self._is_expired(stored_at, now):
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (now, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: K, default: V | None = None) -> V | None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def values(self) -> list[V]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                value
+                for stored_at, value in self._entries.values()
+                if not self._is_expired(stored_at, now)
+            ]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
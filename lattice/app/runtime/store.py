@@ -1,10 +1,24 @@
 from __future__ import annotations
 
 import base64
-import json
+import hashlib
+import logging
+import pickle
+import queue
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections.abc import Iterator, MutableMapping
 from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import index, itemgetter
 from pathlib import Path
 
+import orjson
+import ormsgpack
+
 from lattice.app.graph.contracts import GraphEdge
 from lattice.app.ingestion.contracts import (
     ChunkMetadata,
@@ -14,7 +28,47 @@ from lattice.app.ingestion.contracts import (
 )
 from lattice.app.memory.contracts import ConversationTurn
 from lattice.app.observability.contracts import QueryTrace
-from lattice.app.retrieval.contracts import RetrievalBundle
+from lattice.app.retrieval.contracts import (
+    LexicalCorpus,
+    RetrievalBundle,
+    RetrievalHit,
+)
+from lattice.app.retrieval.lexical import (
+    build_demo_document_corpus,
+    build_graph_edge_corpus,
+)
+from lattice.app.runtime.cache import BoundedCache
+
+RETRIEVAL_CACHE_MAXSIZE = 10_000
+RETRIEVAL_CACHE_TTL_SECONDS = 3600
+QUERY_EMBEDDING_CACHE_MAXSIZE = 50_000
+SEMANTIC_RETRIEVAL_CACHE_MAXSIZE = 256
+COUNT_CACHE_MAXSIZE = 1024
+COUNT_CACHE_TTL_SECONDS = 60
+GRAPH_SEARCH_CACHE_MAXSIZE = 256
+GRAPH_SEARCH_CACHE_TTL_SECONDS = 900
+RUNTIME_WAL_COMPACTION_RATIO = 4
+RUNTIME_WAL_MIN_COMPACTION_BYTES = 1 << 20
+RUNTIME_COMPACTION_DEBOUNCE_SECONDS = 0.05
+PROTOTYPE_CACHE_VERSION = 2
+
+_WAL_FRAME_HEADER = struct.Struct("<I")
+_MSGPACK_CONTAINER32 = struct.Struct(">BI")
+_MSGPACK_ARRAY32 = 0xDD
+_MSGPACK_MAP32 = 0xDF
+_chunk_metadata_fields = itemgetter(
+    "source", "page", "offset_start", "offset_end", "user_id"
+)
+_job_fields = itemgetter(
+    "job_id", "status", "stage", "filename", "content_type", "user_id", "chunk_count"
+)
+_upload_fields = itemgetter("job_id", "user_id", "filename", "content_type")
+_persistence_lock = threading.RLock()
+_compaction_lock = threading.Lock()
+_compaction_queue: queue.Queue[RuntimeStore] = queue.Queue(maxsize=1)
+_compaction_thread: threading.Thread | None = None
+_compaction_thread_lock = threading.Lock()
+logger = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -41,10 +95,38 @@ class CompletedOAuthSession:
     created_at: int
 
 
+@dataclass(frozen=True)
+class SemanticCacheEntry:
+    scope: str
+    unit_vector: array
+    bundle: RetrievalBundle
+    # Leading dimensions as floats, for a cheap distance bound before the dot.
+    prefix: tuple[float, ...]
+
+
+@dataclass(frozen=True)
+class PrototypeData:
+    demo_docs: list[dict[str, str]]
+    graph_edges: list[GraphEdge]
+    demo_corpus: LexicalCorpus
+    graph_corpus: LexicalCorpus
+
+
+@dataclass(frozen=True)
+class _RuntimeSnapshot:
+    jobs: list[IngestionJob]
+    # Hydrated users carry chunks; users never accessed carry their stored rows.
+    chunks_by_user: list[tuple[str, list[DocumentChunk] | list[object]]]
+    uploads: list[QueuedUpload]
+    stored_contents: dict[str, str] | None = None
+
+
 @dataclass
 class RuntimeStore:
     ingestion_jobs: dict[str, IngestionJob] = field(default_factory=dict)
-    private_chunks_by_user: dict[str, list[DocumentChunk]] = field(default_factory=dict)
+    private_chunks_by_user: MutableMapping[str, list[DocumentChunk]] = field(
+        default_factory=dict
+    )
     queued_uploads: dict[str, QueuedUpload] = field(default_factory=dict)
     conversation_turns_by_thread: dict[str, list[ConversationTurn]] = field(
         default_factory=dict
@@ -55,32 +137,101 @@ class RuntimeStore:
     oauth_completed_by_state: dict[str, CompletedOAuthSession] = field(
         default_factory=dict
     )
-    query_embedding_cache: dict[str, tuple[float, ...]] = field(default_factory=dict)
-    retrieval_cache: dict[str, RetrievalBundle] = field(default_factory=dict)
+    query_embedding_cache: BoundedCache[str, array] = field(
+        default_factory=lambda: BoundedCache(maxsize=QUERY_EMBEDDING_CACHE_MAXSIZE)
+    )
+    retrieval_cache: BoundedCache[str, RetrievalBundle] = field(
+        default_factory=lambda: BoundedCache(
+            maxsize=RETRIEVAL_CACHE_MAXSIZE,
+            ttl_seconds=RETRIEVAL_CACHE_TTL_SECONDS,
+        )
+    )
+    semantic_retrieval_cache: BoundedCache[str, SemanticCacheEntry] = field(
+        default_factory=lambda: BoundedCache(
+            maxsize=SEMANTIC_RETRIEVAL_CACHE_MAXSIZE,
+            ttl_seconds=RETRIEVAL_CACHE_TTL_SECONDS,
+        )
+    )
+    document_count_cache: BoundedCache[str, int] = field(
+        default_factory=lambda: BoundedCache(
+            maxsize=COUNT_CACHE_MAXSIZE,
+            ttl_seconds=COUNT_CACHE_TTL_SECONDS,
+        )
+    )
+    graph_edge_count_cache: BoundedCache[str, int] = field(
+        default_factory=lambda: BoundedCache(
+            maxsize=1,
+            ttl_seconds=COUNT_CACHE_TTL_SECONDS,
+        )
+    )
+    graph_search_cache: BoundedCache[str, tuple[RetrievalHit, ...]] = field(
+        default_factory=lambda: BoundedCache(
+            maxsize=GRAPH_SEARCH_CACHE_MAXSIZE,
+            ttl_seconds=GRAPH_SEARCH_CACHE_TTL_SECONDS,
+        )
+    )
     query_trace_log: list[QueryTrace] = field(default_factory=list)
     shared_demo_documents: list[dict[str, str]] = field(default_factory=list)
     shared_graph_edges: list[GraphEdge] = field(default_factory=list)
+    shared_demo_corpus: LexicalCorpus = field(default_factory=LexicalCorpus)
+    shared_graph_corpus: LexicalCorpus = field(default_factory=LexicalCorpus)
 
 
+@lru_cache(maxsize=1)
 def _repo_root() -> Path:
     return Path(__file__).resolve().parents[3]
 
 
+@lru_cache(maxsize=1)
 def _runtime_state_path() -> Path:
     base = _repo_root() / ".tmp"
     base.mkdir(parents=True, exist_ok=True)
-    return base / "runtime_state.json"
+    return base / "runtime_state.msgpack"
+
+
+def _legacy_runtime_state_path() -> Path:
+    return _runtime_state_path().with_name("runtime_state.json")
+
+
+def _runtime_wal_path() -> Path:
+    return _runtime_state_path().with_name("runtime_state.wal")
+
+
+def _compacting_wal_path() -> Path:
+    return _runtime_state_path().with_name("runtime_state.wal.compacting")
 
 
 def _load_json(path: Path) -> object:
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    return orjson.loads(path.read_bytes())
 
 
-def _serialize_chunk(chunk: DocumentChunk) -> dict[str, object]:
-    return {
+def _encode_embedding(embedding: tuple[float, ...]) -> bytes:
+    packed = array("f", embedding)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _decode_embedding(raw: bytes, dimensions: int) -> tuple[float, ...] | None:
+    if len(raw) != dimensions * 4:
+        return None
+    unpacked = array("f")
+    unpacked.frombytes(raw)
+    if sys.byteorder != "little":
+        unpacked.byteswap()
+    return tuple(unpacked)
+
+
+def _content_ref(content: str) -> str:
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def _serialize_chunk(
+    chunk: DocumentChunk,
+    content_by_ref: dict[str, str] | None = None,
+) -> dict[str, object]:
+    row: dict[str, object] = {
         "chunk_id": chunk.chunk_id,
-        "content": chunk.content,
         "metadata": {
             "source": chunk.metadata.source,
             "page": chunk.metadata.page,
@@ -88,31 +239,65 @@ def _serialize_chunk(chunk: DocumentChunk) -> dict[str, object]:
             "offset_end": chunk.metadata.offset_end,
             "user_id": chunk.metadata.user_id,
         },
-        "embedding": list(chunk.embedding),
+        "embedding_f32": _encode_embedding(chunk.embedding),
+        "embedding_dim": len(chunk.embedding),
     }
+    if content_by_ref is None:
+        row["content"] = chunk.content
+    else:
+        ref = _content_ref(chunk.content)
+        content_by_ref.setdefault(ref, chunk.content)
+        row["content_ref"] = ref
+    return row
+
+
+def _deserialize_embedding(payload: dict[str, object]) -> tuple[float, ...] | None:
+    dimensions = payload.get("embedding_dim")
+    raw = payload.get("embedding_f32")
+    if isinstance(raw, bytes) and isinstance(dimensions, int):
+        return _decode_embedding(raw, dimensions)
+
+    # Legacy JSON snapshots stored embeddings as float lists.
+    embedding = payload.get("embedding")
+    if not isinstance(embedding, list):
+        return None
+    try:
+        return tuple(array("d", embedding))
+    except (TypeError, OverflowError):
+        return None
 
 
-def _deserialize_chunk(payload: object) -> DocumentChunk | None:
+def _deserialize_chunk(
+    payload: object,
+    contents: dict[str, str] | None = None,
+) -> DocumentChunk | None:
     if not isinstance(payload, dict):
         return None
     chunk_id = payload.get("chunk_id")
     content = payload.get("content")
+    content_ref = payload.get("content_ref")
+    if content is None and contents and isinstance(content_ref, str):
+        content = contents.get(content_ref)
     metadata = payload.get("metadata")
-    embedding = payload.get("embedding")
     if not isinstance(chunk_id, str) or not isinstance(content, str):
         return None
-    if not isinstance(metadata, dict) or not isinstance(embedding, list):
+    if not isinstance(metadata, dict):
         return None
-    source = metadata.get("source")
-    page = metadata.get("page")
-    offset_start = metadata.get("offset_start")
-    offset_end = metadata.get("offset_end")
-    user_id = metadata.get("user_id")
-    if not all(isinstance(value, str) for value in (source, user_id)):
+    embedding = _deserialize_embedding(payload)
+    if embedding is None:
         return None
-    if not all(isinstance(value, int) for value in (page, offset_start, offset_end)):
+    try:
+        source, page, offset_start, offset_end, user_id = _chunk_metadata_fields(
+            metadata
+        )
+        page, offset_start, offset_end = (
+            index(page),
+            index(offset_start),
+            index(offset_end),
+        )
+    except (KeyError, TypeError):
         return None
-    if not all(isinstance(value, (int, float)) for value in embedding):
+    if not isinstance(source, str) or not isinstance(user_id, str):
         return None
     return DocumentChunk(
         chunk_id=chunk_id,
@@ -124,7 +309,7 @@ def _deserialize_chunk(payload: object) -> DocumentChunk | None:
             offset_end=offset_end,
             user_id=user_id,
         ),
-        embedding=tuple(float(value) for value in embedding),
+        embedding=embedding,
     )
 
 
@@ -144,21 +329,19 @@ def _serialize_job(job: IngestionJob) -> dict[str, object]:
 def _deserialize_job(payload: object) -> IngestionJob | None:
     if not isinstance(payload, dict):
         return None
-    job_id = payload.get("job_id")
-    status = payload.get("status")
-    stage = payload.get("stage")
-    filename = payload.get("filename")
-    content_type = payload.get("content_type")
-    user_id = payload.get("user_id")
-    chunk_count = payload.get("chunk_count")
+    try:
+        job_id, status, stage, filename, content_type, user_id, chunk_count = (
+            _job_fields(payload)
+        )
+        chunk_count = index(chunk_count)
+    except (KeyError, TypeError):
+        return None
     error_message = payload.get("error_message")
     if not all(
         isinstance(value, str)
         for value in (job_id, status, stage, filename, content_type, user_id)
     ):
         return None
-    if not isinstance(chunk_count, int):
-        return None
     if error_message is not None and not isinstance(error_message, str):
         return None
     return IngestionJob(
@@ -179,7 +362,7 @@ def _serialize_upload(upload: QueuedUpload) -> dict[str, object]:
         "user_id": upload.user_id,
         "filename": upload.filename,
         "content_type": upload.content_type,
-        "file_bytes_b64": base64.b64encode(upload.file_bytes).decode("ascii"),
+        "file_bytes": upload.file_bytes,
         "user_access_token": upload.user_access_token,
     }
 
@@ -187,23 +370,27 @@ def _serialize_upload(upload: QueuedUpload) -> dict[str, object]:
 def _deserialize_upload(payload: object) -> QueuedUpload | None:
     if not isinstance(payload, dict):
         return None
-    job_id = payload.get("job_id")
-    user_id = payload.get("user_id")
-    filename = payload.get("filename")
-    content_type = payload.get("content_type")
+    try:
+        job_id, user_id, filename, content_type = _upload_fields(payload)
+    except KeyError:
+        return None
+    file_bytes = payload.get("file_bytes")
     file_bytes_b64 = payload.get("file_bytes_b64")
     user_access_token = payload.get("user_access_token")
     if not all(
-        isinstance(value, str)
-        for value in (job_id, user_id, filename, content_type, file_bytes_b64)
+        isinstance(value, str) for value in (job_id, user_id, filename, content_type)
     ):
         return None
     if user_access_token is not None and not isinstance(user_access_token, str):
         return None
-    try:
-        file_bytes = base64.b64decode(file_bytes_b64.encode("ascii"), validate=True)
-    except Exception:
-        return None
+    if not isinstance(file_bytes, bytes):
+        if not isinstance(file_bytes_b64, str):
+            return None
+        # Legacy JSON snapshots stored upload bytes as base64 text.
+        try:
+            file_bytes = base64.b64decode(file_bytes_b64.encode("ascii"), validate=True)
+        except ValueError:
+            return None
     return QueuedUpload(
         job_id=job_id,
         user_id=user_id,
@@ -214,13 +401,27 @@ def _deserialize_upload(payload: object) -> QueuedUpload | None:
     )
 
 
+def _migrate_legacy_runtime_state(path: Path) -> None:
+    legacy_path = _legacy_runtime_state_path()
+    if path.exists() or not legacy_path.exists():
+        return
+    try:
+        payload = orjson.loads(legacy_path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return
+    temp_path = path.with_suffix(".tmp")
+    temp_path.write_bytes(ormsgpack.packb(payload))
+    temp_path.replace(path)
+    legacy_path.unlink()
+
+
 def _load_persisted_runtime_state() -> dict[str, object]:
     path = _runtime_state_path()
+    _migrate_legacy_runtime_state(path)
     if not path.exists():
         return {}
     try:
-        with path.open("r", encoding="utf-8") as handle:
-            payload = json.load(handle)
+        payload = ormsgpack.unpackb(path.read_bytes())
         if not isinstance(payload, dict):
             return {}
         return payload
@@ -229,29 +430,270 @@ def _load_persisted_runtime_state() -> dict[str, object]:
 
 
 def persist_runtime_state(store: RuntimeStore) -> None:
-    payload = {
-        "ingestion_jobs": [
-            _serialize_job(job) for job in store.ingestion_jobs.values()
-        ],
-        "private_chunks_by_user": {
-            user_id: [_serialize_chunk(chunk) for chunk in chunks]
-            for user_id, chunks in store.private_chunks_by_user.items()
-        },
-        "queued_uploads": [
-            _serialize_upload(upload) for upload in store.queued_uploads.values()
-        ],
-    }
+    with _compaction_lock:
+        # Only the copy and the WAL hand-off block request-path writers; the
+        # snapshot itself is serialized and written outside the lock.
+        with _persistence_lock:
+            snapshot = _capture_runtime_snapshot(store)
+            _rotate_runtime_wal()
+        _write_runtime_snapshot(snapshot)
+        _compacting_wal_path().unlink(missing_ok=True)
+
+
+def _rotate_runtime_wal() -> None:
+    # Events appended after the copy land in a fresh WAL. A rotated WAL left by
+    # a failed compaction is kept and extended, since the snapshot it fed never
+    # landed; replaying events the snapshot already holds is idempotent.
+    wal_path = _runtime_wal_path()
+    if not wal_path.exists():
+        return
+    compacting_path = _compacting_wal_path()
+    if not compacting_path.exists():
+        wal_path.replace(compacting_path)
+        return
+    # Re-frame rather than concatenate so a torn tail in the older file cannot
+    # hide the events behind it.
+    events = [*_load_wal_events(compacting_path), *_load_wal_events(wal_path)]
+    temp_path = compacting_path.with_suffix(".tmp")
+    temp_path.write_bytes(b"".join(map(_frame_runtime_event, events)))
+    temp_path.replace(compacting_path)
+    wal_path.unlink()
+
+
+def _capture_runtime_snapshot(store: RuntimeStore) -> _RuntimeSnapshot:
+    chunks = store.private_chunks_by_user
+    if isinstance(chunks, LazyUserChunks):
+        chunks_by_user = list(chunks.iter_serialized())
+        stored_contents = chunks.stored_contents
+    else:
+        chunks_by_user = [(user_id, list(rows)) for user_id, rows in chunks.items()]
+        stored_contents = None
+    return _RuntimeSnapshot(
+        jobs=list(store.ingestion_jobs.values()),
+        chunks_by_user=chunks_by_user,
+        uploads=list(store.queued_uploads.values()),
+        stored_contents=stored_contents,
+    )
+
+
+def _snapshot_chunk_row(
+    row: DocumentChunk | object,
+    stored_contents: dict[str, str] | None,
+    content_by_ref: dict[str, str],
+) -> object:
+    if isinstance(row, DocumentChunk):
+        return _serialize_chunk(row, content_by_ref)
+    # A stored row is written back unchanged; only its shared content moves over.
+    if isinstance(row, dict) and stored_contents:
+        ref = row.get("content_ref")
+        if isinstance(ref, str) and ref in stored_contents:
+            content_by_ref.setdefault(ref, stored_contents[ref])
+    return row
+
+
+def _write_runtime_snapshot(snapshot: _RuntimeSnapshot) -> None:
+    # Each row is packed and written as it is serialized, so peak memory stays
+    # near one row instead of the whole payload plus its encoded copy.
+    jobs = snapshot.jobs
+    chunks_by_user = snapshot.chunks_by_user
+    uploads = snapshot.uploads
+    content_by_ref: dict[str, str] = {}
     path = _runtime_state_path()
     temp_path = path.with_suffix(".tmp")
-    with temp_path.open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle)
+    with temp_path.open("wb") as handle:
+        handle.write(_MSGPACK_CONTAINER32.pack(_MSGPACK_MAP32, 4))
+        handle.write(ormsgpack.packb("ingestion_jobs"))
+        handle.write(_MSGPACK_CONTAINER32.pack(_MSGPACK_ARRAY32, len(jobs)))
+        for job in jobs:
+            handle.write(ormsgpack.packb(_serialize_job(job)))
+        handle.write(ormsgpack.packb("private_chunks_by_user"))
+        handle.write(_MSGPACK_CONTAINER32.pack(_MSGPACK_MAP32, len(chunks_by_user)))
+        for user_id, chunks in chunks_by_user:
+            handle.write(ormsgpack.packb(user_id))
+            handle.write(_MSGPACK_CONTAINER32.pack(_MSGPACK_ARRAY32, len(chunks)))
+            for row in chunks:
+                payload = _snapshot_chunk_row(
+                    row, snapshot.stored_contents, content_by_ref
+                )
+                handle.write(ormsgpack.packb(payload))
+        handle.write(ormsgpack.packb("queued_uploads"))
+        handle.write(_MSGPACK_CONTAINER32.pack(_MSGPACK_ARRAY32, len(uploads)))
+        for upload in uploads:
+            handle.write(ormsgpack.packb(_serialize_upload(upload)))
+        handle.write(ormsgpack.packb("contents"))
+        handle.write(ormsgpack.packb(content_by_ref))
     temp_path.replace(path)
 
 
+def _frame_runtime_event(event: dict[str, object]) -> bytes:
+    record = ormsgpack.packb(event)
+    return _WAL_FRAME_HEADER.pack(len(record)) + record
+
+
+def _append_runtime_event(store: RuntimeStore, event: dict[str, object]) -> None:
+    wal_path = _runtime_wal_path()
+    with wal_path.open("ab") as handle:
+        handle.write(_frame_runtime_event(event))
+        wal_size = handle.tell()
+    if wal_size < RUNTIME_WAL_MIN_COMPACTION_BYTES:
+        return
+    snapshot_path = _runtime_state_path()
+    snapshot_size = snapshot_path.stat().st_size if snapshot_path.exists() else 0
+    if wal_size > snapshot_size * RUNTIME_WAL_COMPACTION_RATIO:
+        _schedule_compaction(store)
+
+
+def _compaction_loop() -> None:
+    while True:
+        store = _compaction_queue.get()
+        time.sleep(RUNTIME_COMPACTION_DEBOUNCE_SECONDS)
+        # Requests that arrived during the debounce window share this write.
+        while True:
+            try:
+                store = _compaction_queue.get_nowait()
+            except queue.Empty:
+                break
+            _compaction_queue.task_done()
+        try:
+            persist_runtime_state(store)
+        except (OSError, ormsgpack.MsgpackEncodeError):
+            # The WALs still hold every mutation; the next request retries.
+            logger.exception("Runtime state compaction failed")
+        finally:
+            _compaction_queue.task_done()
+
+
+def _schedule_compaction(store: RuntimeStore) -> None:
+    global _compaction_thread
+    with _compaction_thread_lock:
+        if _compaction_thread is None or not _compaction_thread.is_alive():
+            _compaction_thread = threading.Thread(
+                target=_compaction_loop,
+                name="runtime-state-compaction",
+                daemon=True,
+            )
+            _compaction_thread.start()
+    try:
+        _compaction_queue.put_nowait(store)
+    except queue.Full:
+        pass
+
+
+def record_job_upsert(store: RuntimeStore, job: IngestionJob) -> None:
+    with _persistence_lock:
+        store.ingestion_jobs[job.job_id] = job
+        _append_runtime_event(store, {"op": "job_upsert", "job": _serialize_job(job)})
+
+
+def record_chunks_add(
+    store: RuntimeStore, user_id: str, chunks: list[DocumentChunk]
+) -> None:
+    with _persistence_lock:
+        store.private_chunks_by_user.setdefault(user_id, []).extend(chunks)
+        _append_runtime_event(
+            store,
+            {
+                "op": "chunk_add",
+                "user_id": user_id,
+                "chunks": [_serialize_chunk(chunk) for chunk in chunks],
+            },
+        )
+
+
+def record_upload_enqueue(store: RuntimeStore, upload: QueuedUpload) -> None:
+    with _persistence_lock:
+        store.queued_uploads[upload.job_id] = upload
+        _append_runtime_event(
+            store, {"op": "upload_enqueue", "upload": _serialize_upload(upload)}
+        )
+
+
+def record_upload_dequeue(store: RuntimeStore, job_id: str) -> None:
+    with _persistence_lock:
+        store.queued_uploads.pop(job_id, None)
+        _append_runtime_event(store, {"op": "upload_dequeue", "job_id": job_id})
+
+
+def _load_runtime_events() -> list[dict[str, object]]:
+    # A rotated WAL only survives when its compaction did not finish, and it
+    # always predates the active one.
+    return [
+        *_load_wal_events(_compacting_wal_path()),
+        *_load_wal_events(_runtime_wal_path()),
+    ]
+
+
+def _load_wal_events(wal_path: Path) -> list[dict[str, object]]:
+    if not wal_path.exists():
+        return []
+    raw = wal_path.read_bytes()
+    events: list[dict[str, object]] = []
+    offset = 0
+    header_size = _WAL_FRAME_HEADER.size
+    while offset + header_size <= len(raw):
+        (length,) = _WAL_FRAME_HEADER.unpack_from(raw, offset)
+        start = offset + header_size
+        end = start + length
+        if end > len(raw):
+            # A torn trailing write; everything before it is still valid.
+            break
+        try:
+            event = ormsgpack.unpackb(raw[start:end])
+        except ormsgpack.MsgpackDecodeError:
+            break
+        if isinstance(event, dict):
+            events.append(event)
+        offset = end
+    return events
+
+
+def _replay_runtime_events(
+    events: list[dict[str, object]],
+    *,
+    ingestion_jobs: dict[str, IngestionJob],
+    private_chunks_by_user: MutableMapping[str, list[DocumentChunk]],
+    queued_uploads: dict[str, QueuedUpload],
+) -> None:
+    for event in events:
+        op = event.get("op")
+        if op == "job_upsert":
+            job = _deserialize_job(event.get("job"))
+            if job:
+                ingestion_jobs[job.job_id] = job
+        elif op == "chunk_add":
+            user_id = event.get("user_id")
+            rows = event.get("chunks")
+            if not isinstance(user_id, str) or not isinstance(rows, list):
+                continue
+            existing = private_chunks_by_user.setdefault(user_id, [])
+            # Replay may overlap a snapshot written just before the WAL was cut.
+            seen = {chunk.chunk_id for chunk in existing}
+            for row in rows:
+                chunk = _deserialize_chunk(row)
+                if chunk and chunk.chunk_id not in seen:
+                    existing.append(chunk)
+                    seen.add(chunk.chunk_id)
+            if not existing:
+                del private_chunks_by_user[user_id]
+        elif op == "upload_enqueue":
+            upload = _deserialize_upload(event.get("upload"))
+            if upload:
+                queued_uploads[upload.job_id] = upload
+        elif op == "upload_dequeue":
+            job_id = event.get("job_id")
+            if isinstance(job_id, str):
+                queued_uploads.pop(job_id, None)
+
+
 def clear_runtime_state_persistence() -> None:
-    path = _runtime_state_path()
-    if path.exists():
-        path.unlink()
+    for path in (
+        _runtime_state_path(),
+        _legacy_runtime_state_path(),
+        _runtime_wal_path(),
+        _compacting_wal_path(),
+    ):
+        if path.exists():
+            path.unlink()
 
 
 def _hydrate_ingestion_jobs(raw_jobs: object) -> dict[str, IngestionJob]:
@@ -266,19 +708,106 @@ def _hydrate_ingestion_jobs(raw_jobs: object) -> dict[str, IngestionJob]:
     return jobs
 
 
-def _hydrate_private_chunks(raw_chunks: object) -> dict[str, list[DocumentChunk]]:
+def _hydrate_user_chunks(
+    rows: list[object], contents: dict[str, str] | None
+) -> list[DocumentChunk]:
+    return [chunk for row in rows if (chunk := _deserialize_chunk(row, contents))]
+
+
+def _hydrate_private_chunks(
+    raw_chunks: object,
+    raw_contents: object = None,
+) -> dict[str, list[DocumentChunk]]:
     if not isinstance(raw_chunks, dict):
         return {}
+    contents = raw_contents if isinstance(raw_contents, dict) else None
     chunks_by_user: dict[str, list[DocumentChunk]] = {}
     for user_id, rows in raw_chunks.items():
         if not isinstance(user_id, str) or not isinstance(rows, list):
             continue
-        hydrated = [chunk for row in rows if (chunk := _deserialize_chunk(row))]
+        hydrated = _hydrate_user_chunks(rows, contents)
         if hydrated:
             chunks_by_user[user_id] = hydrated
     return chunks_by_user
 
 
+class LazyUserChunks(MutableMapping[str, list[DocumentChunk]]):
+    def __init__(self, raw_chunks: object = None, raw_contents: object = None) -> None:
+        self._raw_rows_by_user: dict[str, list[object]] = {}
+        if isinstance(raw_chunks, dict):
+            self._raw_rows_by_user = {
+                user_id: rows
+                for user_id, rows in raw_chunks.items()
+                if isinstance(user_id, str) and isinstance(rows, list) and rows
+            }
+        self._contents = raw_contents if isinstance(raw_contents, dict) else None
+        self._chunks_by_user: dict[str, list[DocumentChunk]] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, user_id: str) -> list[DocumentChunk]:
+        chunks = self._chunks_by_user.get(user_id)
+        if chunks is not None:
+            return chunks
+        with self._lock:
+            chunks = self._chunks_by_user.get(user_id)
+            if chunks is not None:
+                return chunks
+            rows = self._raw_rows_by_user.pop(user_id, None)
+            if rows is None:
+                raise KeyError(user_id)
+            chunks = _hydrate_user_chunks(rows, self._contents)
+            self._chunks_by_user[user_id] = chunks
+            return chunks
+
+    def __setitem__(self, user_id: str, chunks: list[DocumentChunk]) -> None:
+        with self._lock:
+            self._raw_rows_by_user.pop(user_id, None)
+            self._chunks_by_user[user_id] = chunks
+
+    def __delitem__(self, user_id: str) -> None:
+        with self._lock:
+            found = self._raw_rows_by_user.pop(user_id, None) is not None
+            found = self._chunks_by_user.pop(user_id, None) is not None or found
+        if not found:
+            raise KeyError(user_id)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([*self._chunks_by_user, *self._raw_rows_by_user])
+
+    def __len__(self) -> int:
+        return len(self._chunks_by_user) + len(self._raw_rows_by_user)
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self._chunks_by_user or user_id in self._raw_rows_by_user
+
+    def clear(self) -> None:
+        with self._lock:
+            self._raw_rows_by_user.clear()
+            self._chunks_by_user.clear()
+
+    @property
+    def stored_contents(self) -> dict[str, str] | None:
+        return self._contents
+
+    def iter_serialized(
+        self,
+    ) -> Iterator[tuple[str, list[DocumentChunk] | list[object]]]:
+        # Users never accessed keep their stored rows, so snapshotting does not
+        # hydrate them; hydrated users are copied for serialization.
+        with self._lock:
+            rows_by_user: list[tuple[str, list[DocumentChunk] | list[object]]] = [
+                *(
+                    (user_id, list(chunks))
+                    for user_id, chunks in self._chunks_by_user.items()
+                ),
+                *(
+                    (user_id, list(rows))
+                    for user_id, rows in self._raw_rows_by_user.items()
+                ),
+            ]
+        return iter(rows_by_user)
+
+
 def _hydrate_queued_uploads(raw_uploads: object) -> dict[str, QueuedUpload]:
     if not isinstance(raw_uploads, list):
         return {}
@@ -291,14 +820,7 @@ def _hydrate_queued_uploads(raw_uploads: object) -> dict[str, QueuedUpload]:
     return uploads
 
 
-def _build_store() -> RuntimeStore:
-    repo_root = _repo_root()
-    demo_docs_path = repo_root / "data" / "prototype" / "private_documents.json"
-    graph_path = repo_root / "data" / "prototype" / "graph_edges.json"
-
-    demo_docs_raw = _load_json(demo_docs_path)
-    graph_raw = _load_json(graph_path)
-
+def _parse_demo_documents(demo_docs_raw: object) -> list[dict[str, str]]:
     demo_docs: list[dict[str, str]] = []
     if isinstance(demo_docs_raw, list):
         for item in demo_docs_raw:
@@ -318,7 +840,10 @@ def _build_store() -> RuntimeStore:
                             "content": content,
                         }
                     )
+    return demo_docs
+
 
+def _parse_graph_edges(graph_raw: object) -> list[GraphEdge]:
     graph_edges: list[GraphEdge] = []
     if isinstance(graph_raw, dict) and isinstance(graph_raw.get("edges"), list):
         for edge in graph_raw["edges"]:
@@ -340,13 +865,78 @@ def _build_store() -> RuntimeStore:
                         evidence=evidence,
                     )
                 )
+    return graph_edges
+
+
+def _prototype_cache_key(*paths: Path) -> tuple[object, ...]:
+    signature: list[object] = [PROTOTYPE_CACHE_VERSION]
+    for path in paths:
+        stat = path.stat()
+        signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def _read_prototype_cache(
+    cache_path: Path, cache_key: tuple[object, ...]
+) -> PrototypeData | None:
+    # This runs at import, and a stale or foreign pickle can fail in many ways,
+    # so any failure just rebuilds from the JSON sources.
+    try:
+        cached_key, cached = pickle.loads(cache_path.read_bytes())
+    except Exception:  # noqa: BLE001 - never fatal at import
+        return None
+    if cached_key != cache_key or not isinstance(cached, PrototypeData):
+        return None
+    return cached
+
+
+def _load_prototype_data(
+    demo_docs_path: Path, graph_path: Path, *, cache_path: Path
+) -> PrototypeData:
+    cache_key = _prototype_cache_key(demo_docs_path, graph_path)
+    cached = _read_prototype_cache(cache_path, cache_key)
+    if cached is not None:
+        return cached
+
+    demo_docs = _parse_demo_documents(_load_json(demo_docs_path))
+    graph_edges = _parse_graph_edges(_load_json(graph_path))
+    data = PrototypeData(
+        demo_docs=demo_docs,
+        graph_edges=graph_edges,
+        demo_corpus=build_demo_document_corpus(demo_docs),
+        graph_corpus=build_graph_edge_corpus(graph_edges),
+    )
+    try:
+        temp_path = cache_path.with_suffix(".pkl.tmp")
+        temp_path.write_bytes(
+            pickle.dumps((cache_key, data), protocol=pickle.HIGHEST_PROTOCOL)
+        )
+        temp_path.replace(cache_path)
+    except OSError:
+        pass
+    return data
+
+
+def _build_store() -> RuntimeStore:
+    repo_root = _repo_root()
+    prototype = _load_prototype_data(
+        repo_root / "data" / "prototype" / "private_documents.json",
+        repo_root / "data" / "prototype" / "graph_edges.json",
+        cache_path=_runtime_state_path().with_name("prototype_cache.pkl"),
+    )
 
     persisted = _load_persisted_runtime_state()
     ingestion_jobs = _hydrate_ingestion_jobs(persisted.get("ingestion_jobs"))
-    private_chunks_by_user = _hydrate_private_chunks(
-        persisted.get("private_chunks_by_user")
+    private_chunks_by_user = LazyUserChunks(
+        persisted.get("private_chunks_by_user"), persisted.get("contents")
     )
     queued_uploads = _hydrate_queued_uploads(persisted.get("queued_uploads"))
+    _replay_runtime_events(
+        _load_runtime_events(),
+        ingestion_jobs=ingestion_jobs,
+        private_chunks_by_user=private_chunks_by_user,
+        queued_uploads=queued_uploads,
+    )
 
     for upload_job_id in queued_uploads:
         if upload_job_id not in ingestion_jobs:
@@ -366,8 +956,10 @@ def _build_store() -> RuntimeStore:
         ingestion_jobs=ingestion_jobs,
         private_chunks_by_user=private_chunks_by_user,
         queued_uploads=queued_uploads,
-        shared_demo_documents=demo_docs,
-        shared_graph_edges=graph_edges,
+        shared_demo_documents=prototype.demo_docs,
+        shared_graph_edges=prototype.graph_edges,
+        shared_demo_corpus=prototype.demo_corpus,
+        shared_graph_corpus=prototype.graph_corpus,
     )
 
 
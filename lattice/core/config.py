@@ -3,6 +3,8 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass
 
+TRUE_ENV_TOKENS = frozenset({"1", "true", "yes", "on"})
+
 
 @dataclass(frozen=True)
 class AppConfig:
@@ -28,27 +30,28 @@ class AppConfig:
 
 
 def load_app_config() -> AppConfig:
-    enable_langgraph_raw = os.getenv("ENABLE_LANGGRAPH", "true").lower().strip()
+    env = os.environ
+    enable_langgraph_raw = env.get("ENABLE_LANGGRAPH", "true").lower().strip()
     return AppConfig(
-        app_name=os.getenv("APP_NAME", "Lattice Agentic Graph RAG"),
-        app_version=os.getenv("APP_VERSION", "0.2.0"),
-        environment=os.getenv("APP_ENV", "development"),
-        embedding_dimensions=int(os.getenv("EMBEDDING_DIMENSIONS", "1536")),
-        embedding_backend=os.getenv("EMBEDDING_BACKEND", "deterministic"),
-        gemini_embedding_model=os.getenv(
+        app_name=env.get("APP_NAME", "Lattice Agentic Graph RAG"),
+        app_version=env.get("APP_VERSION", "0.2.0"),
+        environment=env.get("APP_ENV", "development"),
+        embedding_dimensions=int(env.get("EMBEDDING_DIMENSIONS", "1536")),
+        embedding_backend=env.get("EMBEDDING_BACKEND", "deterministic"),
+        gemini_embedding_model=env.get(
             "GEMINI_EMBEDDING_MODEL", "models/gemini-embedding-001"
         ),
-        supabase_url=os.getenv("SUPABASE_URL"),
-        supabase_anon_key=os.getenv("SUPABASE_ANON_KEY"),
-        neo4j_uri=os.getenv("NEO4J_URI"),
-        neo4j_username=os.getenv("NEO4J_USERNAME"),
-        neo4j_password=os.getenv("NEO4J_PASSWORD"),
-        neo4j_database=os.getenv("NEO4J_DATABASE", "neo4j"),
-        enable_langgraph=enable_langgraph_raw in {"1", "true", "yes", "on"},
-        critic_backend=os.getenv("CRITIC_BACKEND", "deterministic"),
-        critic_model=os.getenv("CRITIC_MODEL", "gemini-2.5-flash"),
-        critic_max_refinements=int(os.getenv("CRITIC_MAX_REFINEMENTS", "1")),
-        rerank_backend=os.getenv("RERANK_BACKEND", "heuristic"),
-        rerank_model=os.getenv("RERANK_MODEL", "gemini-2.5-flash"),
-        planner_max_steps=int(os.getenv("PLANNER_MAX_STEPS", "6")),
+        supabase_url=env.get("SUPABASE_URL"),
+        supabase_anon_key=env.get("SUPABASE_ANON_KEY"),
+        neo4j_uri=env.get("NEO4J_URI"),
+        neo4j_username=env.get("NEO4J_USERNAME"),
+        neo4j_password=env.get("NEO4J_PASSWORD"),
+        neo4j_database=env.get("NEO4J_DATABASE", "neo4j"),
+        enable_langgraph=enable_langgraph_raw in TRUE_ENV_TOKENS,
+        critic_backend=env.get("CRITIC_BACKEND", "deterministic"),
+        critic_model=env.get("CRITIC_MODEL", "gemini-2.5-flash"),
+        critic_max_refinements=int(env.get("CRITIC_MAX_REFINEMENTS", "1")),
+        rerank_backend=env.get("RERANK_BACKEND", "heuristic"),
+        rerank_model=env.get("RERANK_MODEL", "gemini-2.5-flash"),
+        planner_max_steps=int(env.get("PLANNER_MAX_STEPS", "6")),
     )
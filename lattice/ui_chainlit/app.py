@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import os
+from collections.abc import Awaitable, Callable
 from pathlib import Path
 from urllib.parse import parse_qs, urlparse
 from uuid import uuid4
@@ -380,15 +381,14 @@ async def _show_trace_steps(trace: dict[str, object]) -> None:
 def _format_citations(citations: object) -> str:
     if not isinstance(citations, list) or not citations:
         return "No citations available."
-    rows: list[str] = []
-    for item in citations:
-        if not isinstance(item, dict):
-            continue
-        source_id = item.get("source_id")
-        location = item.get("location")
-        if isinstance(source_id, str) and isinstance(location, str):
-            rows.append(f"- `{source_id}` at `{location}`")
-    return "\n".join(rows) if rows else "No citations available."
+    rows = [
+        f"- `{source_id}` at `{location}`"
+        for item in citations
+        if isinstance(item, dict)
+        and isinstance(source_id := item.get("source_id"), str)
+        and isinstance(location := item.get("location"), str)
+    ]
+    return "\n".join(rows) or "No citations available."
 
 
 @cl.on_chat_start
@@ -425,289 +425,294 @@ async def on_chat_start() -> None:
     ).send()
 
 
-@cl.on_message
-async def on_message(message: cl.Message) -> None:
-    content = message.content.strip()
-    await _claim_pending_oauth(notify=True)
+async def _handle_auth_command(content: str) -> None:
+    parts = content.split(" ", 2)
+    action = parts[1] if len(parts) > 1 else ""
 
-    if content.startswith("/auth "):
-        parts = content.split(" ", 2)
-        action = parts[1] if len(parts) > 1 else ""
+    if action == "signup":
+        signup_parts = content.split(" ", 3)
+        if len(signup_parts) < 4:
+            await cl.Message(content="Use `/auth signup <email> <password>`.").send()
+            return
+        email = signup_parts[2].strip()
+        password = signup_parts[3].strip()
+        _, detail = await _supabase_password_signup(email, password)
+        await cl.Message(content=detail).send()
+        return
 
-        if action == "signup":
-            signup_parts = content.split(" ", 3)
-            if len(signup_parts) < 4:
-                await cl.Message(
-                    content="Use `/auth signup <email> <password>`."
-                ).send()
-                return
-            email = signup_parts[2].strip()
-            password = signup_parts[3].strip()
-            _, detail = await _supabase_password_signup(email, password)
-            await cl.Message(content=detail).send()
+    if action == "login":
+        login_parts = content.split(" ", 3)
+        if len(login_parts) < 4:
+            await cl.Message(content="Use `/auth login <email> <password>`.").send()
             return
+        email = login_parts[2].strip()
+        password = login_parts[3].strip()
+        _, detail = await _supabase_password_login(email, password)
+        await cl.Message(content=detail).send()
+        return
 
-        if action == "login":
-            login_parts = content.split(" ", 3)
-            if len(login_parts) < 4:
-                await cl.Message(content="Use `/auth login <email> <password>`.").send()
-                return
-            email = login_parts[2].strip()
-            password = login_parts[3].strip()
-            _, detail = await _supabase_password_login(email, password)
+    if action == "providers":
+        response = await _get("/api/v1/auth/oauth/providers")
+        if response.status_code != 200:
+            await cl.Message(content=f"Provider lookup failed: {response.text}").send()
+            return
+        body = response.json()
+        providers = body.get("providers")
+        if not isinstance(providers, list) or not providers:
+            await cl.Message(content="No OAuth providers available.").send()
+            return
+        await cl.Message(
+            content="OAuth providers: " + ", ".join(str(item) for item in providers)
+        ).send()
+        return
+
+    if action in {"oauth", "oauth-url"}:
+        if len(parts) < 3 or not parts[2].strip():
+            await cl.Message(content="Use `/auth oauth <provider>`.").send()
+            return
+        provider = parts[2].strip().lower()
+        ok, detail = await _start_oauth(provider)
+        if not ok:
             await cl.Message(content=detail).send()
             return
+        await cl.Message(content=detail).send()
+        return
 
-        if action == "providers":
-            response = await _get("/api/v1/auth/oauth/providers")
-            if response.status_code != 200:
-                await cl.Message(
-                    content=f"Provider lookup failed: {response.text}"
-                ).send()
-                return
-            body = response.json()
-            providers = body.get("providers")
-            if not isinstance(providers, list) or not providers:
-                await cl.Message(content="No OAuth providers available.").send()
-                return
+    if action == "callback":
+        callback_parts = content.split(" ", 2)
+        if len(callback_parts) < 3 or not callback_parts[2].strip():
             await cl.Message(
-                content="OAuth providers: " + ", ".join(str(item) for item in providers)
+                content="Use `/auth callback <callback_url or access_token [refresh_token]>`."
             ).send()
             return
 
-        if action in {"oauth", "oauth-url"}:
-            if len(parts) < 3 or not parts[2].strip():
-                await cl.Message(content="Use `/auth oauth <provider>`.").send()
-                return
-            provider = parts[2].strip().lower()
-            ok, detail = await _start_oauth(provider)
-            if not ok:
-                await cl.Message(content=detail).send()
-                return
-            await cl.Message(content=detail).send()
+        parsed = _parse_oauth_callback_input(callback_parts[2].strip())
+        state = parsed.get("state")
+        access_token = parsed.get("access_token")
+        refresh_token = parsed.get("refresh_token")
+        error = parsed.get("error")
+
+        if isinstance(error, str) and error:
+            await cl.Message(content=f"OAuth provider error: {error}").send()
             return
 
-        if action == "callback":
-            callback_parts = content.split(" ", 2)
-            if len(callback_parts) < 3 or not callback_parts[2].strip():
+        if isinstance(state, str) and state:
+            complete_payload = {
+                "state": state,
+                "access_token": access_token,
+                "refresh_token": refresh_token,
+                "error": error,
+            }
+            complete_response = await _post(
+                "/api/v1/auth/oauth/complete",
+                complete_payload,
+            )
+            if complete_response.status_code != 200:
                 await cl.Message(
-                    content="Use `/auth callback <callback_url or access_token [refresh_token]>`."
+                    content=f"OAuth callback completion failed: {complete_response.text}"
                 ).send()
                 return
-
-            parsed = _parse_oauth_callback_input(callback_parts[2].strip())
-            state = parsed.get("state")
-            access_token = parsed.get("access_token")
-            refresh_token = parsed.get("refresh_token")
-            error = parsed.get("error")
-
-            if isinstance(error, str) and error:
-                await cl.Message(content=f"OAuth provider error: {error}").send()
-                return
-
-            if isinstance(state, str) and state:
-                complete_payload = {
-                    "state": state,
-                    "access_token": access_token,
-                    "refresh_token": refresh_token,
-                    "error": error,
-                }
-                complete_response = await _post(
-                    "/api/v1/auth/oauth/complete",
-                    complete_payload,
-                )
-                if complete_response.status_code != 200:
-                    await cl.Message(
-                        content=f"OAuth callback completion failed: {complete_response.text}"
-                    ).send()
-                    return
-                _set_pending_oauth_state(state)
-                claimed = await _claim_pending_oauth(notify=False)
-                if claimed:
-                    await cl.Message(
-                        content="OAuth callback linked successfully."
-                    ).send()
-                else:
-                    await cl.Message(
-                        content="OAuth callback stored. Send any message to finish linking."
-                    ).send()
-                return
-
-            if isinstance(access_token, str) and access_token.strip():
-                _set_auth_tokens(
-                    access_token.strip(),
-                    refresh_token if isinstance(refresh_token, str) else None,
-                )
+            _set_pending_oauth_state(state)
+            claimed = await _claim_pending_oauth(notify=False)
+            if claimed:
+                await cl.Message(content="OAuth callback linked successfully.").send()
+            else:
                 await cl.Message(
-                    content="Callback token(s) stored for this chat session."
+                    content="OAuth callback stored. Send any message to finish linking."
                 ).send()
-                return
-
-            await cl.Message(content="Missing callback state or access token.").send()
-            return
-
-        if action == "refresh":
-            _, detail = await _supabase_refresh_session()
-            await cl.Message(content=detail).send()
             return
 
-        if action == "status":
-            await _claim_pending_oauth(notify=False)
-            has_access = bool(_auth_token())
-            has_refresh = bool(_refresh_token())
-            pending_state = _pending_oauth_state()
-            next_step = (
-                "Start auth with `/auth login` or `/auth oauth <provider>`."
-                if not has_access
-                else "You can now use `/upload` for private docs."
+        if isinstance(access_token, str) and access_token.strip():
+            _set_auth_tokens(
+                access_token.strip(),
+                refresh_token if isinstance(refresh_token, str) else None,
             )
             await cl.Message(
-                content=(
-                    f"Auth status:\n- access token: {has_access}\n"
-                    f"- refresh token: {has_refresh}\n"
-                    f"- pending oauth state: {bool(pending_state)}\n"
-                    f"Next step: {next_step}"
-                )
+                content="Callback token(s) stored for this chat session."
             ).send()
             return
 
-        if action == "set" and len(parts) == 3 and parts[2].strip():
-            _set_auth_tokens(parts[2].strip(), _refresh_token())
-            await cl.Message(content="Supabase JWT set for this chat session.").send()
-            return
-        if action == "clear":
-            _clear_auth_tokens()
-            _clear_pending_oauth_state()
-            await cl.Message(
-                content="Supabase tokens and pending OAuth state cleared for this chat session."
-            ).send()
-            return
+        await cl.Message(content="Missing callback state or access token.").send()
+        return
+
+    if action == "refresh":
+        _, detail = await _supabase_refresh_session()
+        await cl.Message(content=detail).send()
+        return
+
+    if action == "status":
+        await _claim_pending_oauth(notify=False)
+        has_access = bool(_auth_token())
+        has_refresh = bool(_refresh_token())
+        pending_state = _pending_oauth_state()
+        next_step = (
+            "Start auth with `/auth login` or `/auth oauth <provider>`."
+            if not has_access
+            else "You can now use `/upload` for private docs."
+        )
         await cl.Message(
             content=(
-                "Use `/auth signup <email> <password>`, `/auth login <email> <password>`, "
-                "`/auth providers`, `/auth oauth <provider>`, `/auth callback <callback_url or tokens>`, "
-                "`/auth refresh`, `/auth status`, `/auth set <jwt>`, or `/auth clear`."
+                f"Auth status:\n- access token: {has_access}\n"
+                f"- refresh token: {has_refresh}\n"
+                f"- pending oauth state: {bool(pending_state)}\n"
+                f"Next step: {next_step}"
             )
         ).send()
         return
 
-    if content.startswith("/key "):
-        parts = content.split(" ", 2)
-        action = parts[1] if len(parts) > 1 else "help"
-        payload: dict[str, object] = {"action": action}
-        if action == "set" and len(parts) == 3:
-            payload["key"] = parts[2].strip()
-
-        response = await _post("/api/v1/runtime/key", payload)
-        if response.status_code != 200:
-            await cl.Message(
-                content=f"Runtime key command failed: {response.text}"
-            ).send()
-            return
-        await cl.Message(content=f"Runtime key response: {response.json()}").send()
+    if action == "set" and len(parts) == 3 and parts[2].strip():
+        _set_auth_tokens(parts[2].strip(), _refresh_token())
+        await cl.Message(content="Supabase JWT set for this chat session.").send()
+        return
+    if action == "clear":
+        _clear_auth_tokens()
+        _clear_pending_oauth_state()
+        await cl.Message(
+            content="Supabase tokens and pending OAuth state cleared for this chat session."
+        ).send()
         return
+    await cl.Message(
+        content=(
+            "Use `/auth signup <email> <password>`, `/auth login <email> <password>`, "
+            "`/auth providers`, `/auth oauth <provider>`, `/auth callback <callback_url or tokens>`, "
+            "`/auth refresh`, `/auth status`, `/auth set <jwt>`, or `/auth clear`."
+        )
+    ).send()
 
-    if content == "/upload":
-        if not _auth_token():
-            await cl.Message(
-                content=(
-                    "Upload is a private feature. Authenticate first with `/auth login` "
-                    "or `/auth oauth <provider>`."
-                )
-            ).send()
-            return
 
-        files = await cl.AskFileMessage(
-            content="Upload one PDF, DOCX, MD, or TXT file.",
-            accept=[
-                "application/pdf",
-                "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                "text/plain",
-                "text/markdown",
-            ],
-            max_files=1,
-            max_size_mb=25,
-            timeout=120,
-        ).send()
-        if not files:
-            await cl.Message(content="Upload cancelled.").send()
-            return
+async def _handle_key_command(content: str) -> None:
+    parts = content.split(" ", 2)
+    action = parts[1] if len(parts) > 1 else "help"
+    payload: dict[str, object] = {"action": action}
+    if action == "set" and len(parts) == 3:
+        payload["key"] = parts[2].strip()
 
-        file_response = files[0]
-        file_path = Path(file_response.path)
-        if not file_path.exists():
-            await cl.Message(content="Upload path not found.").send()
-            return
+    response = await _post("/api/v1/runtime/key", payload)
+    if response.status_code != 200:
+        await cl.Message(content=f"Runtime key command failed: {response.text}").send()
+        return
+    await cl.Message(content=f"Runtime key response: {response.json()}").send()
 
-        file_name = file_response.name or file_path.name
-        mime_type = file_response.type or "application/octet-stream"
-        if not _is_supported_upload(file_name, mime_type):
-            await cl.Message(
-                content=(
-                    "Unsupported upload type. Use one of: PDF, DOCX, MD, TXT. "
-                    f"Detected file `{file_name}` with MIME `{mime_type}`."
-                )
-            ).send()
-            return
 
-        file_bytes = file_path.read_bytes()
-        response = await _post_files(
-            "/api/v1/private/ingestion/upload",
-            {
-                "file": (
-                    file_name,
-                    file_bytes,
-                    mime_type,
-                )
-            },
-            timeout=120.0,
-        )
+async def _handle_upload_command(_content: str) -> None:
+    if not _auth_token():
+        await cl.Message(
+            content=(
+                "Upload is a private feature. Authenticate first with `/auth login` "
+                "or `/auth oauth <provider>`."
+            )
+        ).send()
+        return
 
-        if response.status_code != 200:
-            await cl.Message(content=f"Upload failed: {response.text}").send()
-            return
+    files = await cl.AskFileMessage(
+        content="Upload one PDF, DOCX, MD, or TXT file.",
+        accept=[
+            "application/pdf",
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            "text/plain",
+            "text/markdown",
+        ],
+        max_files=1,
+        max_size_mb=25,
+        timeout=120,
+    ).send()
+    if not files:
+        await cl.Message(content="Upload cancelled.").send()
+        return
 
-        body = response.json()
-        job_id = body.get("job_id")
-        if not isinstance(job_id, str):
-            await cl.Message(content=f"Upload response missing job_id: {body}").send()
-            return
+    file_response = files[0]
+    file_path = Path(file_response.path)
+    if not file_path.exists():
+        await cl.Message(content="Upload path not found.").send()
+        return
 
+    file_name = file_response.name or file_path.name
+    mime_type = file_response.type or "application/octet-stream"
+    if not _is_supported_upload(file_name, mime_type):
         await cl.Message(
             content=(
-                f"Ingestion queued for `{file_name}` (job `{job_id}`). "
-                "I will monitor progress to completion."
+                "Unsupported upload type. Use one of: PDF, DOCX, MD, TXT. "
+                f"Detected file `{file_name}` with MIME `{mime_type}`."
             )
         ).send()
+        return
 
-        final_job = await _poll_ingestion_job(job_id)
-        if not isinstance(final_job, dict):
-            return
+    file_bytes = file_path.read_bytes()
+    response = await _post_files(
+        "/api/v1/private/ingestion/upload",
+        {
+            "file": (
+                file_name,
+                file_bytes,
+                mime_type,
+            )
+        },
+        timeout=120.0,
+    )
 
-        final_status = final_job.get("status")
-        final_stage = final_job.get("stage")
-        chunk_count = final_job.get("chunk_count")
-        error_message = final_job.get("error_message")
-        if final_status == "success":
-            await cl.Message(
-                content=(
-                    f"Ingestion complete: status=`{final_status}`, stage=`{final_stage}`, "
-                    f"chunks={chunk_count}. Ask a question about `{file_name}` now."
-                )
-            ).send()
-            return
+    if response.status_code != 200:
+        await cl.Message(content=f"Upload failed: {response.text}").send()
+        return
 
-        hint = _upload_error_hint(
-            error_message if isinstance(error_message, str) else None
+    body = response.json()
+    job_id = body.get("job_id")
+    if not isinstance(job_id, str):
+        await cl.Message(content=f"Upload response missing job_id: {body}").send()
+        return
+
+    await cl.Message(
+        content=(
+            f"Ingestion queued for `{file_name}` (job `{job_id}`). "
+            "I will monitor progress to completion."
         )
+    ).send()
+
+    final_job = await _poll_ingestion_job(job_id)
+    if not isinstance(final_job, dict):
+        return
+
+    final_status = final_job.get("status")
+    final_stage = final_job.get("stage")
+    chunk_count = final_job.get("chunk_count")
+    error_message = final_job.get("error_message")
+    if final_status == "success":
         await cl.Message(
             content=(
-                f"Ingestion failed at stage `{final_stage}`: {error_message}\n"
-                f"Suggested fix: {hint}"
+                f"Ingestion complete: status=`{final_status}`, stage=`{final_stage}`, "
+                f"chunks={chunk_count}. Ask a question about `{file_name}` now."
             )
         ).send()
         return
 
+    hint = _upload_error_hint(error_message if isinstance(error_message, str) else None)
+    await cl.Message(
+        content=(
+            f"Ingestion failed at stage `{final_stage}`: {error_message}\n"
+            f"Suggested fix: {hint}"
+        )
+    ).send()
+
+
+_COMMAND_HANDLERS: dict[str, Callable[[str], Awaitable[None]]] = {
+    "/auth ": _handle_auth_command,
+    "/key ": _handle_key_command,
+    "/upload": _handle_upload_command,
+}
+
+
+@cl.on_message
+async def on_message(message: cl.Message) -> None:
+    content = message.content.strip()
+    await _claim_pending_oauth(notify=True)
+
+    head_end = content.find(" ")
+    handler = _COMMAND_HANDLERS.get(
+        content if head_end < 0 else content[: head_end + 1]
+    )
+    if handler:
+        await handler(content)
+        return
+
     response = await _post(
         "/api/v1/query",
         {"question": content, "thread_id": cl.user_session.get("thread_id")},
@@ -76,6 +76,7 @@ def _create_schema(driver: Driver, database: str) -> None:
         "CREATE INDEX title_name_idx IF NOT EXISTS FOR (t:Title) ON (t.title)",
         "CREATE INDEX title_type_idx IF NOT EXISTS FOR (t:Title) ON (t.type)",
         "CREATE INDEX title_release_year_idx IF NOT EXISTS FOR (t:Title) ON (t.release_year)",
+        "CREATE FULLTEXT INDEX title_text_idx IF NOT EXISTS FOR (t:Title) ON EACH [t.title, t.description]",
     ]
     with driver.session(database=database) as session:
         for query in schema_queries:
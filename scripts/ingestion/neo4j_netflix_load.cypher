@@ -31,6 +31,9 @@ FOR (t:Title) ON (t.type);
 CREATE INDEX title_release_year_idx IF NOT EXISTS
 FOR (t:Title) ON (t.release_year);
 
+CREATE FULLTEXT INDEX title_text_idx IF NOT EXISTS
+FOR (t:Title) ON EACH [t.title, t.description];
+
 CALL {
   LOAD CSV WITH HEADERS FROM $csvUrl AS row
   WITH row
@@ -157,6 +157,43 @@ begin
 end;
 $$;
 
+-- Batched variant: upsert every chunk of a document in one round trip.
+create or replace function public.upsert_embedding_chunks(
+  p_chunks jsonb
+)
+returns void
+language plpgsql
+security invoker
+as $$
+begin
+  insert into public.embeddings (
+    id,
+    user_id,
+    source,
+    chunk_id,
+    content,
+    metadata,
+    embedding
+  )
+  select
+    c->>'p_id',
+    (c->>'p_user_id')::uuid,
+    c->>'p_source',
+    c->>'p_chunk_id',
+    c->>'p_content',
+    coalesce(c->'p_metadata', '{}'::jsonb),
+    (c->>'p_embedding')::vector
+  from jsonb_array_elements(p_chunks) as c
+  on conflict (id)
+  do update set
+    source = excluded.source,
+    chunk_id = excluded.chunk_id,
+    content = excluded.content,
+    metadata = excluded.metadata,
+    embedding = excluded.embedding;
+end;
+$$;
+
 -- RPC helper for vector similarity search behind PostgREST.
 create or replace function public.match_embeddings(
   query_embedding text,
@@ -175,15 +212,21 @@ language sql
 stable
 security invoker
 as $$
-  select
-    e.id,
-    e.source,
-    e.chunk_id,
-    e.content,
-    e.metadata,
-    1 - (e.embedding <=> query_embedding::vector) as similarity
-  from public.embeddings as e
-  where 1 - (e.embedding <=> query_embedding::vector) > match_threshold
-  order by (e.embedding <=> query_embedding::vector) asc
-  limit match_count;
+  -- Take the nearest rows first so the ivfflat index serves the ORDER BY/LIMIT;
+  -- filtering on the distance expression would force a scan of every row.
+  select nearest.*
+  from (
+    select
+      e.id,
+      e.source,
+      e.chunk_id,
+      e.content,
+      e.metadata,
+      1 - (e.embedding <=> query_embedding::vector) as similarity
+    from public.embeddings as e
+    order by e.embedding <=> query_embedding::vector asc
+    limit match_count
+  ) as nearest
+  where nearest.similarity > match_threshold
+  order by nearest.similarity desc;
 $$;
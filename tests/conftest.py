@@ -18,4 +18,8 @@ def reset_runtime_store() -> None:
     runtime_store.oauth_completed_by_state.clear()
     runtime_store.query_embedding_cache.clear()
     runtime_store.retrieval_cache.clear()
+    runtime_store.semantic_retrieval_cache.clear()
+    runtime_store.document_count_cache.clear()
+    runtime_store.graph_edge_count_cache.clear()
+    runtime_store.graph_search_cache.clear()
     runtime_store.query_trace_log.clear()
@@ -1,6 +1,11 @@
+import logging
+
+import pytest
 from fastapi.testclient import TestClient
+from jwt import PyJWKSetError
 
 import lattice.app.api.app as api_app
+from lattice.app.auth import verify
 from lattice.app.auth.contracts import AuthContext
 from lattice.app.auth.verify import AuthConfigurationError
 from main import app
@@ -46,3 +51,51 @@ def test_auth_session_reports_configuration_error(monkeypatch) -> None:
         )
 
         assert response.status_code == 503
+
+
+@pytest.fixture
+def scheduled_refreshes(monkeypatch) -> list[tuple[float, object]]:
+    scheduled: list[tuple[float, object]] = []
+
+    class _RecordingTimer:
+        def __init__(self, interval: float, function: object, args: tuple) -> None:
+            scheduled.append((interval, function))
+            self.daemon = False
+
+        def start(self) -> None:
+            pass
+
+    monkeypatch.setattr(verify.threading, "Timer", _RecordingTimer)
+    return scheduled
+
+
+def test_jwks_refresh_reschedules_after_unexpected_error(
+    monkeypatch, scheduled_refreshes
+) -> None:
+    def failing_client(_jwks_url: str) -> object:
+        raise RuntimeError("connection reset")
+
+    monkeypatch.setattr(verify, "_get_jwks_client", failing_client)
+
+    verify._refresh_jwks("https://example.test/jwks")
+
+    assert scheduled_refreshes == [
+        (verify.JWKS_REFRESH_INTERVAL_SECONDS, verify._refresh_jwks)
+    ]
+
+
+def test_jwks_refresh_logs_expected_failures(
+    monkeypatch, caplog, scheduled_refreshes
+) -> None:
+    class _EmptyJwksClient:
+        def get_jwk_set(self, refresh: bool) -> None:
+            raise PyJWKSetError("The JWK Set did not contain any keys")
+
+    monkeypatch.setattr(verify, "_get_jwks_client", lambda _url: _EmptyJwksClient())
+
+    with caplog.at_level(logging.WARNING, logger=verify.__name__):
+        verify._refresh_jwks("https://example.test/jwks")
+
+    assert [record.levelno for record in caplog.records] == [logging.WARNING]
+    assert "did not contain any keys" in caplog.text
+    assert len(scheduled_refreshes) == 1
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import pytest
+
+from lattice.app.graph import neo4j_store
+from lattice.app.graph.neo4j_store import (
+    MISSING_INDEX_ERROR_CODE,
+    TITLE_INDEX_STATEMENT,
+    TITLE_SCAN_STATEMENT,
+    TITLE_SHOW_ID_STATEMENT,
+    Neo4jGraphStore,
+)
+
+
+class _ClientError(Exception):
+    def __init__(self, code: str, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class _StubbedGraphStore(Neo4jGraphStore):
+    def __init__(self, rows: list[dict[str, object]]) -> None:
+        self.rows = rows
+        self.statements: list[str] = []
+        self.index_error: _ClientError | None = None
+        self._client_error = _ClientError
+        self._title_index_retry_at = 0.0
+
+    def _run(self, statement: str, **params: object) -> list[dict[str, object]]:
+        self.statements.append(statement)
+        if statement == TITLE_INDEX_STATEMENT and self.index_error is not None:
+            raise self.index_error
+        return self.rows
+
+
+def test_title_profile_drops_null_and_repeated_names() -> None:
+    store = _StubbedGraphStore(
+        [
+            {
+                "show_id": "s1",
+                "title": "Dick Johnson Is Dead",
+                "type": "Movie",
+                "release_year": 2020,
+                "description": "",
+                "directors": ["Kirsten Johnson", "Kirsten Johnson", None],
+                "actors": ["A", "B", "A", "C", "D", "E"],
+                "genres": None,
+                "countries": ["United States", "United States"],
+                "rating": "PG-13",
+                "relevance": 1.0,
+            }
+        ]
+    )
+
+    hits = store.search("s1")
+
+    assert store.statements == [TITLE_SHOW_ID_STATEMENT]
+    assert len(hits) == 1
+    assert "directors: Kirsten Johnson;" in hits[0].content
+    assert "cast: A, B, C, D;" in hits[0].content
+    assert "genres:" not in hits[0].content
+    assert "countries: United States;" in hits[0].content
+
+
+def test_missing_title_index_falls_back_until_cooldown(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(neo4j_store.time, "monotonic", lambda: now[0])
+    store = _StubbedGraphStore([])
+    store.index_error = _ClientError(
+        MISSING_INDEX_ERROR_CODE,
+        "There is no such fulltext schema index: title_text_idx",
+    )
+
+    store._title_profile_rows(["dick"], limit=6)
+    store._title_profile_rows(["dick"], limit=6)
+    store.index_error = None
+    now[0] += neo4j_store.TITLE_INDEX_RETRY_SECONDS
+    store._title_profile_rows(["dick"], limit=6)
+
+    assert store.statements == [
+        TITLE_INDEX_STATEMENT,
+        TITLE_SCAN_STATEMENT,
+        TITLE_SCAN_STATEMENT,
+        TITLE_INDEX_STATEMENT,
+    ]
+
+
+def test_other_client_errors_do_not_disable_title_index() -> None:
+    store = _StubbedGraphStore([])
+    store.index_error = _ClientError(
+        "Neo.ClientError.Security.Forbidden", "Read access denied"
+    )
+
+    with pytest.raises(_ClientError):
+        store._title_profile_rows(["dick"], limit=6)
+
+    assert store._title_index_retry_at == 0.0
@@ -3,8 +3,14 @@ from __future__ import annotations
 from fastapi.testclient import TestClient
 
 import lattice.app.api.app as api_app
-from lattice.app.auth.contracts import AuthContext
 from lattice.app.api.app import create_app
+from lattice.app.auth.contracts import AuthContext
+from lattice.app.llm.providers import (
+    CriticDecision,
+    CriticModel,
+    DeterministicCriticModel,
+    GeminiCriticModel,
+)
 from main import app
 
 
@@ -270,3 +276,76 @@ def test_aggregate_route_reports_full_scope_counts() -> None:
         answer = response.json()["answer"]
         assert "documents=3" in answer
         assert "graph_edges=3" in answer
+
+
+def test_runtime_models_are_reused_per_key(monkeypatch) -> None:
+    built_keys: list[str | None] = []
+    build_critic_model = api_app.build_critic_model
+
+    def counting_build_critic_model(**kwargs):
+        built_keys.append(kwargs["runtime_key"])
+        return build_critic_model(**kwargs)
+
+    monkeypatch.setattr(api_app, "build_critic_model", counting_build_critic_model)
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    cached_app = create_app()
+
+    with TestClient(cached_app) as client:
+        headers = {"X-Demo-Session": "demo-model-cache"}
+        client.post(
+            "/api/v1/runtime/key",
+            json={"action": "set", "key": "gemini-test-key"},
+            headers=headers,
+        )
+        for _ in range(2):
+            response = client.post(
+                "/api/v1/query",
+                json={"question": "who directed dick johnson is dead on netflix"},
+                headers=headers,
+            )
+            assert response.status_code == 200
+
+    assert built_keys == ["gemini-test-key"]
+
+
+class _StubGeminiCriticModel(GeminiCriticModel):
+    def __init__(self) -> None:
+        pass
+
+    def evaluate(self, **kwargs) -> CriticDecision:
+        return DeterministicCriticModel().evaluate(**kwargs)
+
+
+def test_runtime_models_retry_after_fallback_build(monkeypatch) -> None:
+    built: list[CriticModel] = []
+
+    def flaky_build_critic_model(**_kwargs) -> CriticModel:
+        # The first Gemini client build fails and falls back, as the factory does.
+        model = DeterministicCriticModel() if not built else _StubGeminiCriticModel()
+        built.append(model)
+        return model
+
+    monkeypatch.setattr(api_app, "build_critic_model", flaky_build_critic_model)
+    monkeypatch.setenv("CRITIC_BACKEND", "google")
+    retry_app = create_app()
+
+    with TestClient(retry_app) as client:
+        headers = {"X-Demo-Session": "demo-model-retry"}
+        client.post(
+            "/api/v1/runtime/key",
+            json={"action": "set", "key": "gemini-test-key"},
+            headers=headers,
+        )
+        for _ in range(3):
+            response = client.post(
+                "/api/v1/query",
+                json={"question": "who directed dick johnson is dead on netflix"},
+                headers=headers,
+            )
+            assert response.status_code == 200
+
+    assert [type(model) for model in built] == [
+        DeterministicCriticModel,
+        _StubGeminiCriticModel,
+    ]
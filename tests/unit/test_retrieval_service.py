@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from lattice.app.response.service import build_answer
+from lattice.app.retrieval.contracts import RetrievalBundle, RetrievalHit
+from lattice.app.retrieval.embeddings import EmbeddingError, EmbeddingProvider
+from lattice.app.retrieval.service import _heuristic_rerank_hits, _rrf_fuse, retrieve
+from lattice.app.runtime.store import runtime_store
+
+
+def _hit(source_id: str, score: float, content: str = "") -> RetrievalHit:
+    return RetrievalHit(
+        source_id=source_id,
+        score=score,
+        content=content or source_id,
+        source_type="private_document",
+        location=f"test://{source_id}",
+    )
+
+
+def test_heuristic_rerank_blends_semantic_and_lexical_scores() -> None:
+    hits = [
+        _hit("semantic-only", 0.9, "unrelated words"),
+        _hit("lexical-match", 0.5, "engineering owners mapping"),
+    ]
+
+    reranked = _heuristic_rerank_hits("engineering owners", hits, limit=2)
+
+    assert [hit.source_id for hit in reranked] == ["semantic-only", "lexical-match"]
+    assert reranked[0].score == 0.7
+    assert reranked[1].score == 0.3
+
+
+def test_rrf_fuse_rewards_hits_ranked_in_both_lists() -> None:
+    doc_hits = [_hit("doc-a", 0.91), _hit("shared", 0.4)]
+    graph_hits = [_hit("shared", 3.5), _hit("graph-b", 2.0)]
+
+    fused = _rrf_fuse([doc_hits, graph_hits], limit=3)
+
+    assert [hit.source_id for hit in fused] == ["shared", "doc-a", "graph-b"]
+    assert all(0.0 < hit.score <= 1.0 for hit in fused)
+
+
+def test_rrf_fuse_scores_single_list_top_hit_as_one() -> None:
+    fused = _rrf_fuse([[_hit("only", 0.2)], []], limit=5)
+
+    assert len(fused) == 1
+    assert fused[0].score == 1.0
+
+
+def test_rrf_fuse_keeps_high_confidence_for_single_source_top_hit() -> None:
+    doc_hits = [_hit("doc-a", 0.91), _hit("doc-b", 0.5)]
+    graph_hits = [_hit("graph-a", 3.5)]
+
+    fused = _rrf_fuse([doc_hits, graph_hits], limit=3)
+    answer = build_answer(
+        "question", RetrievalBundle(route="hybrid", hits=tuple(fused))
+    )
+
+    assert fused[0].score == 1.0
+    assert answer.confidence == "high"
+    assert [hit.score for hit in fused] == sorted(
+        (hit.score for hit in fused), reverse=True
+    )
+
+
+class _FixedEmbeddingProvider(EmbeddingProvider):
+    def embed_query(self, text: str) -> list[float]:
+        return [1.0, 0.0, 0.0] if "owner" in text else [0.0, 1.0, 0.0]
+
+
+class _CountingSupabaseStore:
+    def __init__(self) -> None:
+        self.match_calls = 0
+
+    def match_chunks(self, **_kwargs: object) -> list[RetrievalHit]:
+        self.match_calls += 1
+        return [_hit("chunk-1", 0.8, "engineering owners")]
+
+
+def test_retrieve_reuses_bundle_for_semantically_identical_query() -> None:
+    supabase_store = _CountingSupabaseStore()
+
+    def run(query: str) -> RetrievalBundle:
+        return retrieve(
+            store=runtime_store,
+            route="document",
+            query=query,
+            user_id="user-1",
+            user_access_token="token",
+            embedding_provider=_FixedEmbeddingProvider(),
+            supabase_store=supabase_store,  # type: ignore[arg-type]
+            neo4j_store=None,
+            rerank_backend="heuristic",
+            rerank_model="unused",
+            runtime_key=None,
+        )
+
+    first = run("who is the engineering owner in my notes file")
+    second = run("which file names the owner for engineering work")
+    third = run("summarize my report")
+
+    assert second is first
+    assert third is not first
+    assert supabase_store.match_calls == 2
+
+
+class _CountingGraphStore:
+    def __init__(self) -> None:
+        self.search_calls = 0
+
+    def search(self, **_kwargs: object) -> list[RetrievalHit]:
+        self.search_calls += 1
+        return [_hit("title:dick-johnson-is-dead", 2.0, "Dick Johnson Is Dead")]
+
+
+def test_retrieve_shares_graph_search_across_users() -> None:
+    neo4j_store = _CountingGraphStore()
+
+    def run(user_id: str) -> RetrievalBundle:
+        return retrieve(
+            store=runtime_store,
+            route="graph",
+            query="Who directed Dick Johnson Is Dead?",
+            user_id=user_id,
+            user_access_token=None,
+            embedding_provider=_FixedEmbeddingProvider(),
+            supabase_store=None,
+            neo4j_store=neo4j_store,  # type: ignore[arg-type]
+            rerank_backend="heuristic",
+            rerank_model="unused",
+            runtime_key=None,
+        )
+
+    first = run("user-1")
+    second = run("user-2")
+
+    assert first is not second
+    assert second.hits == first.hits
+    assert neo4j_store.search_calls == 1
+
+
+class _FailingEmbeddingProvider(EmbeddingProvider):
+    def embed_query(self, text: str) -> list[float]:
+        raise EmbeddingError("quota exhausted")
+
+
+def test_retrieve_skips_semantic_cache_when_embedding_fails() -> None:
+    bundle = retrieve(
+        store=runtime_store,
+        route="document",
+        query="who owns engineering",
+        user_id="user-1",
+        user_access_token="token",
+        embedding_provider=_FailingEmbeddingProvider(),
+        supabase_store=_CountingSupabaseStore(),  # type: ignore[arg-type]
+        neo4j_store=None,
+        rerank_backend="heuristic",
+        rerank_model="unused",
+        runtime_key=None,
+    )
+
+    assert "supabase:EmbeddingError" in bundle.backend_failures
+    assert len(runtime_store.semantic_retrieval_cache) == 0
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import lattice.app.runtime.cache as cache_module
+from lattice.app.runtime.cache import BoundedCache
+
+
+def test_bounded_cache_evicts_least_recently_used() -> None:
+    cache: BoundedCache[str, int] = BoundedCache(maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache.get("a") == 1
+
+    cache["c"] = 3
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_bounded_cache_expires_entries_after_ttl(monkeypatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache: BoundedCache[str, int] = BoundedCache(maxsize=4, ttl_seconds=60)
+    cache["a"] = 1
+
+    now[0] = 159.0
+    assert cache.get("a") == 1
+
+    now[0] = 160.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import base64
+import pickle
+from dataclasses import replace
+
+import orjson
+import pytest
+
+import lattice.app.runtime.store as store_module
+from lattice.app.ingestion.contracts import ChunkMetadata, DocumentChunk, IngestionJob
+from lattice.app.runtime.store import (
+    LazyUserChunks,
+    QueuedUpload,
+    RuntimeStore,
+    _hydrate_ingestion_jobs,
+    _hydrate_private_chunks,
+    _hydrate_queued_uploads,
+    _legacy_runtime_state_path,
+    _load_persisted_runtime_state,
+    _load_prototype_data,
+    _load_runtime_events,
+    _replay_runtime_events,
+    _runtime_state_path,
+    persist_runtime_state,
+    record_chunks_add,
+    record_job_upsert,
+    record_upload_dequeue,
+    record_upload_enqueue,
+)
+
+
+def _sample_store() -> RuntimeStore:
+    store = RuntimeStore()
+    store.ingestion_jobs["ing-1"] = IngestionJob(
+        job_id="ing-1",
+        status="success",
+        stage="completed",
+        filename="notes.txt",
+        content_type="text/plain",
+        user_id="user-1",
+        chunk_count=1,
+        error_message=None,
+    )
+    store.private_chunks_by_user["user-1"] = [
+        DocumentChunk(
+            chunk_id="ing-1-chunk-1",
+            content="Engineering owns dependency mapping.",
+            metadata=ChunkMetadata(
+                source="notes.txt",
+                page=1,
+                offset_start=0,
+                offset_end=36,
+                user_id="user-1",
+            ),
+            embedding=(0.25, 0.5, 0.75),
+        )
+    ]
+    store.queued_uploads["ing-2"] = QueuedUpload(
+        job_id="ing-2",
+        user_id="user-1",
+        filename="report.md",
+        content_type="text/markdown",
+        file_bytes=b"# Report\x00\xff",
+        user_access_token=None,
+    )
+    return store
+
+
+def test_persisted_runtime_state_round_trips() -> None:
+    store = _sample_store()
+    persist_runtime_state(store)
+
+    persisted = _load_persisted_runtime_state()
+
+    assert _hydrate_ingestion_jobs(persisted.get("ingestion_jobs")) == (
+        store.ingestion_jobs
+    )
+    assert (
+        _hydrate_private_chunks(
+            persisted.get("private_chunks_by_user"), persisted.get("contents")
+        )
+        == store.private_chunks_by_user
+    )
+    assert _hydrate_queued_uploads(persisted.get("queued_uploads")) == (
+        store.queued_uploads
+    )
+
+
+def test_legacy_float_list_embeddings_still_hydrate() -> None:
+    legacy_row = {
+        "chunk_id": "legacy-chunk",
+        "content": "Legacy snapshot row.",
+        "metadata": {
+            "source": "legacy.md",
+            "page": 1,
+            "offset_start": 0,
+            "offset_end": 20,
+            "user_id": "user-1",
+        },
+        "embedding": [0.1, 0.2, 0.3],
+    }
+
+    hydrated = _hydrate_private_chunks({"user-1": [legacy_row]})
+
+    assert hydrated["user-1"][0].embedding == (0.1, 0.2, 0.3)
+
+
+def test_legacy_json_snapshot_is_migrated_to_msgpack() -> None:
+    legacy_path = _legacy_runtime_state_path()
+    legacy_path.write_bytes(
+        orjson.dumps(
+            {
+                "queued_uploads": [
+                    {
+                        "job_id": "ing-3",
+                        "user_id": "user-1",
+                        "filename": "legacy.txt",
+                        "content_type": "text/plain",
+                        "file_bytes_b64": base64.b64encode(b"legacy").decode(),
+                        "user_access_token": None,
+                    }
+                ]
+            }
+        )
+    )
+
+    persisted = _load_persisted_runtime_state()
+
+    uploads = _hydrate_queued_uploads(persisted.get("queued_uploads"))
+    assert uploads["ing-3"].file_bytes == b"legacy"
+    assert _runtime_state_path().exists()
+    assert not legacy_path.exists()
+
+
+def test_recorded_events_replay_on_top_of_snapshot() -> None:
+    sample = _sample_store()
+    store = RuntimeStore()
+    persist_runtime_state(store)
+
+    record_job_upsert(store, sample.ingestion_jobs["ing-1"])
+    record_chunks_add(store, "user-1", sample.private_chunks_by_user["user-1"])
+    record_upload_enqueue(store, sample.queued_uploads["ing-2"])
+    record_upload_enqueue(store, replace(sample.queued_uploads["ing-2"], job_id="x"))
+    record_upload_dequeue(store, "x")
+
+    persisted = _load_persisted_runtime_state()
+    jobs = _hydrate_ingestion_jobs(persisted.get("ingestion_jobs"))
+    chunks = _hydrate_private_chunks(
+        persisted.get("private_chunks_by_user"), persisted.get("contents")
+    )
+    uploads = _hydrate_queued_uploads(persisted.get("queued_uploads"))
+    _replay_runtime_events(
+        _load_runtime_events(),
+        ingestion_jobs=jobs,
+        private_chunks_by_user=chunks,
+        queued_uploads=uploads,
+    )
+
+    assert jobs == sample.ingestion_jobs
+    assert chunks == sample.private_chunks_by_user
+    assert uploads == sample.queued_uploads
+    assert (jobs, chunks, uploads) == (
+        store.ingestion_jobs,
+        store.private_chunks_by_user,
+        store.queued_uploads,
+    )
+
+
+def test_oversized_wal_is_compacted_in_the_background(monkeypatch) -> None:
+    monkeypatch.setattr(store_module, "RUNTIME_WAL_MIN_COMPACTION_BYTES", 0)
+    monkeypatch.setattr(store_module, "RUNTIME_COMPACTION_DEBOUNCE_SECONDS", 0)
+    sample = _sample_store()
+    store = RuntimeStore()
+
+    record_job_upsert(store, sample.ingestion_jobs["ing-1"])
+    store_module._compaction_queue.join()
+
+    assert not store_module._runtime_wal_path().exists()
+    persisted = _load_persisted_runtime_state()
+    assert _hydrate_ingestion_jobs(persisted.get("ingestion_jobs")) == (
+        sample.ingestion_jobs
+    )
+
+
+def test_failed_compaction_keeps_rotated_wal_for_replay(monkeypatch) -> None:
+    sample = _sample_store()
+    store = RuntimeStore()
+    record_job_upsert(store, sample.ingestion_jobs["ing-1"])
+
+    def fail_write(_snapshot: object) -> None:
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(store_module, "_write_runtime_snapshot", fail_write)
+        with pytest.raises(OSError):
+            persist_runtime_state(store)
+    record_upload_enqueue(store, sample.queued_uploads["ing-2"])
+
+    assert [event["op"] for event in _load_runtime_events()] == [
+        "job_upsert",
+        "upload_enqueue",
+    ]
+
+    persist_runtime_state(store)
+
+    assert _load_runtime_events() == []
+    persisted = _load_persisted_runtime_state()
+    assert _hydrate_ingestion_jobs(persisted.get("ingestion_jobs")) == (
+        sample.ingestion_jobs
+    )
+    assert _hydrate_queued_uploads(persisted.get("queued_uploads")) == (
+        sample.queued_uploads
+    )
+
+
+def test_snapshot_stores_duplicate_chunk_content_once() -> None:
+    store = _sample_store()
+    chunk = store.private_chunks_by_user["user-1"][0]
+    store.private_chunks_by_user["user-2"] = [
+        replace(chunk, metadata=replace(chunk.metadata, user_id="user-2"))
+    ]
+    persist_runtime_state(store)
+
+    persisted = _load_persisted_runtime_state()
+
+    assert list(persisted["contents"].values()) == [chunk.content]
+    hydrated = _hydrate_private_chunks(
+        persisted.get("private_chunks_by_user"), persisted.get("contents")
+    )
+    assert hydrated == store.private_chunks_by_user
+    assert hydrated["user-1"][0].content is hydrated["user-2"][0].content
+
+
+def test_prototype_data_is_served_from_pickle_until_json_changes(tmp_path) -> None:
+    docs_path = tmp_path / "private_documents.json"
+    graph_path = tmp_path / "graph_edges.json"
+    docs_path.write_bytes(
+        orjson.dumps([{"source": "a.md", "chunk_id": "a-1", "content": "Alpha"}])
+    )
+    graph_path.write_bytes(orjson.dumps({"edges": []}))
+
+    cache_path = tmp_path / "prototype_cache.pkl"
+
+    first = _load_prototype_data(docs_path, graph_path, cache_path=cache_path)
+    second = _load_prototype_data(docs_path, graph_path, cache_path=cache_path)
+    docs_path.write_bytes(
+        orjson.dumps([{"source": "b.md", "chunk_id": "b-1", "content": "Beta!"}])
+    )
+    rebuilt = _load_prototype_data(docs_path, graph_path, cache_path=cache_path)
+
+    assert second == first
+    assert second is not first
+    assert rebuilt.demo_docs[0]["source"] == "b.md"
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        b"not a pickle",
+        b"cmissing_prototype_module\nPrototypeData\n.",
+        pickle.dumps(42),
+        pickle.dumps((1, 2, 3)),
+    ],
+)
+def test_unreadable_prototype_cache_is_rebuilt(tmp_path, payload: bytes) -> None:
+    docs_path = tmp_path / "private_documents.json"
+    graph_path = tmp_path / "graph_edges.json"
+    docs_path.write_bytes(
+        orjson.dumps([{"source": "a.md", "chunk_id": "a-1", "content": "Alpha"}])
+    )
+    graph_path.write_bytes(orjson.dumps({"edges": []}))
+    cache_path = tmp_path / "prototype_cache.pkl"
+    cache_path.write_bytes(payload)
+
+    data = _load_prototype_data(docs_path, graph_path, cache_path=cache_path)
+
+    assert data.demo_docs[0]["source"] == "a.md"
+
+
+def test_lazy_user_chunks_only_hydrate_requested_users() -> None:
+    store = _sample_store()
+    chunk = store.private_chunks_by_user["user-1"][0]
+    store.private_chunks_by_user["user-2"] = [
+        replace(chunk, metadata=replace(chunk.metadata, user_id="user-2"))
+    ]
+    persist_runtime_state(store)
+    persisted = _load_persisted_runtime_state()
+
+    lazy = LazyUserChunks(
+        persisted.get("private_chunks_by_user"), persisted.get("contents")
+    )
+
+    assert set(lazy) == {"user-1", "user-2"}
+    assert lazy.get("user-1") == store.private_chunks_by_user["user-1"]
+    assert "user-2" in lazy._raw_rows_by_user
+    assert lazy.get("missing", []) == []
+    assert lazy == store.private_chunks_by_user
+
+
+def test_snapshot_does_not_hydrate_unaccessed_users() -> None:
+    store = _sample_store()
+    chunk = store.private_chunks_by_user["user-1"][0]
+    store.private_chunks_by_user["user-2"] = [
+        replace(
+            chunk,
+            content="Platform owns the release train.",
+            metadata=replace(chunk.metadata, user_id="user-2"),
+        )
+    ]
+    persist_runtime_state(store)
+    persisted = _load_persisted_runtime_state()
+    reloaded = RuntimeStore(
+        private_chunks_by_user=LazyUserChunks(
+            persisted.get("private_chunks_by_user"), persisted.get("contents")
+        )
+    )
+    assert (
+        reloaded.private_chunks_by_user["user-1"]
+        == (store.private_chunks_by_user["user-1"])
+    )
+
+    persist_runtime_state(reloaded)
+
+    lazy = reloaded.private_chunks_by_user
+    assert isinstance(lazy, LazyUserChunks)
+    assert "user-2" in lazy._raw_rows_by_user
+    rewritten = _load_persisted_runtime_state()
+    assert (
+        _hydrate_private_chunks(
+            rewritten.get("private_chunks_by_user"), rewritten.get("contents")
+        )
+        == store.private_chunks_by_user
+    )
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import httpx
+import orjson
+
+from lattice.app.ingestion.contracts import ChunkMetadata, DocumentChunk
+from lattice.app.retrieval.supabase_store import SupabaseVectorStore
+
+
+def _chunks(count: int) -> list[DocumentChunk]:
+    return [
+        DocumentChunk(
+            chunk_id=f"chunk-{index}",
+            content=f"content {index}",
+            metadata=ChunkMetadata(
+                source="notes.md",
+                page=1,
+                offset_start=index,
+                offset_end=index + 1,
+                user_id="user-1",
+            ),
+            embedding=(0.5, -0.5),
+        )
+        for index in range(count)
+    ]
+
+
+def _stubbed_store(handler) -> SupabaseVectorStore:
+    store = SupabaseVectorStore(url="https://example.supabase.co", anon_key="anon")
+    store.close()
+    object.__setattr__(
+        store, "_client", httpx.Client(transport=httpx.MockTransport(handler))
+    )
+    return store
+
+
+def test_upsert_chunks_sends_bounded_batches() -> None:
+    batch_sizes: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/rest/v1/rpc/upsert_embedding_chunks"
+        batch_sizes.append(len(orjson.loads(request.content)["p_chunks"]))
+        return httpx.Response(204)
+
+    store = _stubbed_store(handler)
+    store.upsert_chunks(user_jwt="jwt", chunks=_chunks(250))
+
+    assert batch_sizes == [100, 100, 50]
+
+
+def test_upsert_chunks_falls_back_to_single_row_rpc_when_batch_rpc_missing() -> None:
+    single_ids: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/upsert_embedding_chunks"):
+            return httpx.Response(404, json={"code": "PGRST202"})
+        single_ids.append(orjson.loads(request.content)["p_chunk_id"])
+        return httpx.Response(204)
+
+    store = _stubbed_store(handler)
+    store.upsert_chunks(user_jwt="jwt", chunks=_chunks(3))
+
+    assert single_ids == ["chunk-0", "chunk-1", "chunk-2"]